@@ -0,0 +1,102 @@
+def _char_masks(pattern):
+    """Map each character of the pattern to a bit mask of its positions."""
+    masks = {}
+    bit = 1
+    for char in pattern:
+        masks[char] = masks.get(char, 0) | bit
+        bit <<= 1
+    return masks
+
+
+def _masked_distance(masks, length, text):
+    """Return the Levenshtein distance between a pattern and ``text``.
+
+    Uses Myers' bit-parallel algorithm: one column of the distance matrix is
+    kept as bit vectors of +1/-1 vertical deltas, so each character of
+    ``text`` costs a handful of integer operations instead of a loop over the
+    pattern. ``masks`` comes from ``_char_masks(pattern)`` and ``length`` is
+    the pattern's length, so a pattern compared many times is prepared once.
+    """
+    if not length:
+        return len(text)
+
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    positive, negative = full, 0
+    distance = length
+    for char in text:
+        equal = masks.get(char, 0)
+        vertical = equal | negative
+        horizontal = ((((equal & positive) + positive) & full) ^ positive) | equal
+        h_positive = (negative | ~(horizontal | positive)) & full
+        h_negative = positive & horizontal
+        if h_positive & last:
+            distance += 1
+        elif h_negative & last:
+            distance -= 1
+        h_positive = ((h_positive << 1) | 1) & full
+        h_negative = (h_negative << 1) & full
+        positive = (h_negative | ~(vertical | h_positive)) & full
+        negative = h_positive & vertical
+    return distance
+
+
+def edit_distance(a, b):
+    """Return the Levenshtein distance between two strings."""
+    return _masked_distance(_char_masks(a), len(a), b)
+
+
+class BKTree:
+    """Burkhard-Keller tree for edit-distance lookups over a set of strings.
+
+    Each child edge is labelled with its distance to the parent, so by the
+    triangle inequality a query within ``max_distance`` only has to descend
+    into children whose label is within ``max_distance`` of the query's
+    distance to the parent.
+    """
+
+    def __init__(self, values=()):
+        self.root = None
+        self.size = 0
+        for value in values:
+            self.add(value)
+
+    def add(self, value):
+        """Insert a string into the tree."""
+        if self.root is None:
+            self.root = (value, {})
+            self.size = 1
+            return
+
+        masks, length = _char_masks(value), len(value)
+        node_value, children = self.root
+        while True:
+            distance = _masked_distance(masks, length, node_value)
+            if distance == 0:
+                return
+            child = children.get(distance)
+            if child is None:
+                children[distance] = (value, {})
+                self.size += 1
+                return
+            node_value, children = child
+
+    def search(self, query, max_distance):
+        """Return ``(value, distance)`` pairs within ``max_distance`` of the query."""
+        if self.root is None:
+            return []
+
+        masks, length = _char_masks(query), len(query)
+        matches = []
+        stack = [self.root]
+        while stack:
+            node_value, children = stack.pop()
+            distance = _masked_distance(masks, length, node_value)
+            if distance <= max_distance:
+                matches.append((node_value, distance))
+            low, high = distance - max_distance, distance + max_distance
+            stack.extend(child for label, child in children.items() if low <= label <= high)
+        return matches
+
+    def __len__(self):
+        return self.size
@@ -67,6 +67,7 @@ def create_dev_executable():
         "--windowed",
         "--onedir",  # Create a directory with all dependencies
         "--add-data=README.md:.",
+        "--add-data=public_suffix_list.dat:.",
         "password_analyzer_gui.py"
     ])
     
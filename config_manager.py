@@ -25,6 +25,11 @@ class ConfigManager:
             'last_used_filters': {
                 'domain': '',
                 'email': ''
+            },
+            'query_cache': {
+                'enabled': True,
+                'memory_entries': 128,
+                'max_disk_mb': 64
             }
         }
 
@@ -68,4 +73,10 @@ class ConfigManager:
 
     def get_last_filters(self):
         """Get the last used filters."""
-        return self.config['last_used_filters'] 
\ No newline at end of file
+        return self.config['last_used_filters'] 
+
+    def get_query_cache_settings(self):
+        """Get the query cache settings, filling in defaults for older configs."""
+        settings = dict(self.get_default_config()['query_cache'])
+        settings.update(self.config.get('query_cache', {}))
+        return settings
@@ -4,34 +4,522 @@ from rich.console import Console
 from rich.table import Table
 from rich import print as rprint
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+import hashlib
+import os
+import re
+import numpy as np
+from pandas.api.types import union_categoricals
+from bk_tree import BKTree
+from url_normalizer import URL_COLUMNS, normalize_url
+from vault_readers import PARALLEL_CSV_THRESHOLD, VAULT_COLUMNS, get_reader, read_csv_parallel, read_csv_tail
+
+DIFF_CATEGORIES = ('added', 'removed', 'changed', 'rotated')
+
+# Distinct values needed before regex matching is split across processes
+REGEX_PARALLEL_THRESHOLD = 50000
+
+# Bytes hashed at a time when checking that an export was only appended to
+WATCH_BLOCK_SIZE = 1 << 20
+
+# Rules for choosing which entry of a duplicate group survives a dedupe
+DEDUPE_RULES = ('newest', 'longest_notes', 'most_fields')
+
+# Entries read for the quick preview shown while a large export loads
+PREVIEW_ROWS = 1000
+
+
+class VaultDiff:
+    """Per-category entry counts of a comparison between two vault exports.
+
+    Only the counts are kept; the rows themselves are streamed by
+    ``PasswordManagerAnalyzer.iter_diff``.
+    """
+
+    def __init__(self):
+        self.counts = dict.fromkeys(DIFF_CATEGORIES + ('unchanged',), 0)
+
+    def add(self, category, frame):
+        """Count a chunk of rows for the given category."""
+        self.counts[category] += len(frame)
+
+    def summary(self):
+        """Return the number of entries in each category."""
+        return dict(self.counts)
+
+
+class VaultSummary:
+    """Aggregate counts over an export, updated one chunk at a time.
+
+    Only the per-key counts are kept, so the summary can be fed the whole
+    dataset in one call or built incrementally from streamed chunks.
+    """
+
+    def __init__(self, url_col=None, user_col=None, password_col=None, top_n=10, identity_keys=None):
+        self.url_col = url_col
+        self.identity_keys = identity_keys
+        self.user_col = user_col
+        self.password_col = password_col
+        self.top_n = top_n
+        self.total = 0
+        self.empty_passwords = 0
+        self.domain_counts = pd.Series(dtype='int64')
+        self.account_counts = pd.Series(dtype='int64')
+        self.identity_counts = pd.Series(dtype='int64')
+
+    def update(self, frame):
+        """Add the rows of a DataFrame to the aggregates."""
+        self.total += len(frame)
+
+        if self.url_col in frame:
+            counts = _count_by(frame[self.url_col], lambda urls: urls.map(_url_domain))
+            self.domain_counts = self.domain_counts.add(counts, fill_value=0).astype('int64')
+
+        if self.user_col in frame:
+            counts = _count_by(frame[self.user_col], lambda users: users.astype(str).str.strip().str.lower())
+            self.account_counts = self.account_counts.add(counts, fill_value=0).astype('int64')
+
+        if self.password_col in frame:
+            passwords = frame[self.password_col]
+            empty = passwords.isna() | passwords.astype(str).str.strip().eq('')
+            self.empty_passwords += int(empty.sum())
+
+        # Entries without a url or username (notes, cards) are never duplicates
+        if self.identity_keys:
+            identity, groupable = self.identity_keys(frame)
+        else:
+            identity = _identity_hash(frame, self.url_col, self.user_col)
+            groupable = _has_identity(frame, self.url_col, self.user_col)
+        counts = pd.Series(identity[groupable]).value_counts()
+        self.identity_counts = self.identity_counts.add(counts, fill_value=0).astype('int64')
+
+    @property
+    def duplicate_entries(self):
+        """Number of entries repeating an earlier url + username pair."""
+        return int((self.identity_counts[self.identity_counts > 1] - 1).sum())
+
+    def overview(self):
+        """Return the headline counts."""
+        return {
+            'Total entries': self.total,
+            'Distinct domains': len(self.domain_counts),
+            'Distinct accounts': len(self.account_counts),
+            'Duplicate entries': self.duplicate_entries,
+            'Empty passwords': self.empty_passwords,
+        }
+
+    def top_domains(self):
+        """Return the domains with the most entries."""
+        return self.domain_counts.sort_values(ascending=False, kind='stable').head(self.top_n)
+
+    def top_accounts(self):
+        """Return the emails/usernames with the most entries."""
+        return self.account_counts.sort_values(ascending=False, kind='stable').head(self.top_n)
+
 
 class PasswordManagerAnalyzer:
-    def __init__(self, file_path):
+    def __init__(self, file_path, columns=None, filters=(), cache=None, nrows=None):
         self.console = Console()
-        self.load_data(file_path)
+        self.cache = cache
+        self.load_data(file_path, columns, filters, nrows)
 
-    def load_data(self, file_path):
-        """Load the password manager export file."""
+    def load_data(self, file_path, columns=None, filters=(), nrows=None):
+        """Load the password manager export file.
+
+        When ``columns`` is given only those columns, plus the ones needed by
+        the named ``filters`` ('domain', 'email'), are parsed; the rest of the
+        export is never materialized. When ``nrows`` is given only the first
+        ``nrows`` entries are read, for a quick preview; ``complete`` tells
+        whether that was the whole export.
+        """
         file_extension = Path(file_path).suffix.lower()
+        usecols = self._projection(file_path, file_extension, columns, filters) if columns else None
+        source = {'path': file_path, 'columns': columns, 'filters': filters}
         
         if file_extension == '.csv':
-            self.data = pd.read_csv(file_path)
+            # Projected columns are read as plain strings, skipping type inference
+            read_options = {'usecols': usecols, 'dtype': str} if usecols else {}
+            source['header'] = list(pd.read_csv(file_path, nrows=0).columns)
+            source['read_options'] = read_options
+            if nrows is not None:
+                self.data = pd.read_csv(file_path, nrows=nrows, **read_options)
+            # Large exports are split across processes when more than one core is available
+            elif os.path.getsize(file_path) >= PARALLEL_CSV_THRESHOLD and (os.cpu_count() or 1) > 1:
+                self.data = read_csv_parallel(file_path, **read_options)
+            else:
+                self.data = pd.read_csv(file_path, **read_options)
         else:
-            raise ValueError(f"Unsupported file format: {file_extension}. Please use CSV files.")
+            # Native formats are parsed incrementally in record batches
+            if nrows is not None:
+                batches = islice(get_reader(file_extension)(file_path, batch_size=nrows), 1)
+            else:
+                batches = get_reader(file_extension)(file_path)
+            if usecols:
+                batches = (batch[usecols] for batch in batches)
+            batches = list(batches)
+            if batches:
+                self.data = pd.concat(batches, ignore_index=True)
+            else:
+                self.data = pd.DataFrame(columns=usecols or VAULT_COLUMNS)
+
+        # The previous state is kept until the file was read successfully
+        self._source = source
+        self._fuzzy_index = {}
+
+        # A preview is never cached or followed for appends, only reloaded in full
+        self.complete = nrows is None or len(self.data) < nrows
+        self.fingerprint = self.cache.fingerprint(file_path) if self.cache and self.complete else None
+        # Only CSV exports can be followed by parsing appended bytes
+        self._remember_file_state(file_path, appendable=file_extension == '.csv' and self.complete)
         
         # Standardize column names to lowercase
         self.data.columns = self.data.columns.str.lower()
+        self.normalize_urls()
+        self._loaded_index = self.data.index
+
+    def _remember_file_state(self, file_path, appendable, offset=None, digest=None):
+        """Record how much of the export has been read, to detect changes later.
+
+        ``digest`` is a hash object already fed the first ``offset`` bytes.
+        """
+        stat = os.stat(file_path)
+        offset = stat.st_size if offset is None else offset
+        if appendable:
+            # Appends can only be parsed on their own after a complete record
+            with open(file_path, 'rb') as f:
+                f.seek(max(0, offset - 1))
+                appendable = f.read(min(offset, 1)) in (b'', b'\n')
+        self._file_state = {
+            'offset': offset,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'digest': (digest or _prefix_digest(file_path, offset)) if appendable else None,
+            'appendable': appendable,
+        }
+
+    def _verified_prefix(self, file_path, stat):
+        """Return the hash of the bytes already read if the file only grew since, else None.
+
+        The bytes already read must hash the same as before, so an in-place
+        edit anywhere in the file, such as a rotated password, forces a reload.
+        The returned hash object can be extended with the appended bytes.
+        """
+        state = self._file_state
+        if not state['appendable'] or stat.st_size <= state['offset']:
+            return None
+        digest = _prefix_digest(file_path, state['offset'])
+        return digest if digest.digest() == state['digest'].digest() else None
+
+    def refresh(self):
+        """Pick up changes to the export since it was loaded.
+
+        Returns ``(status, rows)``. When rows were only appended to a CSV
+        export just the new tail bytes are parsed and the data, derived url
+        columns and search indexes are extended in place; ``status`` is
+        'appended' and ``rows`` holds the new rows. Any other change reloads
+        the whole file ('reloaded', all rows). Otherwise ('unchanged', empty).
+        """
+        file_path = self._source['path']
+        stat = os.stat(file_path)
+        state = self._file_state
+        if stat.st_size == state['size'] and stat.st_mtime_ns == state['mtime_ns']:
+            return 'unchanged', self.data.iloc[:0]
+
+        digest = self._verified_prefix(file_path, stat)
+        if digest is None:
+            self.load_data(file_path, self._source['columns'], self._source['filters'])
+            return 'reloaded', self.data
+
+        rows, offset = read_csv_tail(file_path, state['offset'], self._source['header'],
+                                     **self._source['read_options'])
+        # Only the newly read bytes are added to the verified hash
+        _hash_file_range(digest, file_path, state['offset'], offset)
+        self._remember_file_state(file_path, appendable=True, offset=offset, digest=digest)
+        if rows is None:
+            return 'unchanged', self.data.iloc[:0]
+        return 'appended', self._append_rows(rows)
+
+    def _append_rows(self, rows):
+        """Append parsed rows to the data and extend the derived columns and indexes."""
+        rows.columns = rows.columns.str.lower()
+        start = self.data.index.max() + 1 if len(self.data) else 0
+        rows.index = pd.RangeIndex(start, start + len(rows))
+        was_loaded = self.data.index is self._loaded_index
+
+        # Keep the url column categorical, adding only the new distinct URLs
+        domain_col = self._domain_column()
+        if domain_col and self.data[domain_col].dtype == 'category':
+            urls = self.data[domain_col]
+            new_urls = pd.Index(rows[domain_col].dropna().unique()).difference(urls.cat.categories)
+            urls = urls.cat.add_categories(new_urls)
+            self.data[domain_col] = urls
+            rows[domain_col] = pd.Categorical(rows[domain_col], categories=urls.cat.categories)
+
+        self.data = pd.concat([self.data, rows])
+        if self.url_parts is not None and self.data[domain_col].dtype == 'category':
+            # Only the new rows' distinct URLs are normalized
+            new_parts = _url_parts_of(rows[domain_col].cat.remove_unused_categories())
+            self.url_parts = pd.DataFrame({
+                name: union_categoricals([self.url_parts[name].array, new_parts[name].array])
+                for name in URL_COLUMNS
+            }, index=self.data.index)
+        else:
+            self.normalize_urls()
+        if was_loaded:
+            self._loaded_index = self.data.index
+        if self.cache:
+            self.fingerprint = self.cache.fingerprint(self._source['path'])
+
+        for column, (_, keys, tree) in list(self._fuzzy_index.items()):
+            is_url = column == self._domain_column()
+            new_keys = rows[column].map(lambda value: self._fuzzy_key(value, is_url),
+                                        na_action='ignore').astype(object)
+            for key in new_keys.dropna().unique():
+                tree.add(key)
+            self._fuzzy_index[column] = (self.data.index, pd.concat([keys, new_keys]), tree)
+
+        return self.data.loc[rows.index]
+
+    def _projection(self, file_path, file_extension, columns, filters):
+        """Return the header names to read for the requested columns and filters.
+
+        Header names are matched case-insensitively. Returns None when none of
+        the requested columns exist, so the whole export is loaded instead.
+        """
+        if file_extension == '.csv':
+            header = list(pd.read_csv(file_path, nrows=0).columns)
+        else:
+            header = VAULT_COLUMNS
+
+        requested = {col.lower() for col in columns}
+        wanted = set(requested)
+        filters = set(filters)
+        # Derived url columns are computed from the url column
+        if requested & set(URL_COLUMNS):
+            filters.add('domain')
+        for name, column_of in (('domain', _domain_column_of), ('email', _email_column_of)):
+            column = column_of(header) if name in filters else None
+            if column:
+                wanted.add(column.lower())
+
+        usecols = [col for col in header if col.lower() in wanted]
+        available = {col.lower() for col in usecols} | set(URL_COLUMNS)
+        if not usecols or not requested & available:
+            return None
+        return usecols
+
+    def normalize_urls(self):
+        """Derive scheme, host, port, registrable domain and path from the url column.
+
+        Normalization runs once per distinct URL and is broadcast back to the
+        rows as categorical columns kept in ``self.url_parts``, so the cost
+        scales with the number of distinct URLs rather than rows. The url column
+        itself is stored as categorical for the same reason.
+        """
+        self.url_parts = None
+        domain_col = self._domain_column()
+        if not domain_col:
+            return
+        if self.data[domain_col].dtype != 'category':
+            if not pd.api.types.is_string_dtype(self.data[domain_col]):
+                return
+            self.data[domain_col] = self.data[domain_col].astype('category')
+
+        self.url_parts = _url_parts_of(self.data[domain_col])
+
+    def select_columns(self, data, columns=None):
+        """Return the requested columns of ``data``, including derived url columns."""
+        if not columns:
+            return data
+        derived = [col for col in columns if col in URL_COLUMNS and col not in data.columns]
+        if derived and self.url_parts is not None:
+            data = data.join(self.url_parts[derived])
+        return data[columns]
+
+    def iter_chunks(self, file_path, chunksize=100000):
+        """Yield an export file in chunks with standardized column names."""
+        file_extension = Path(file_path).suffix.lower()
+        yield from get_reader(file_extension)(file_path, chunksize)
+
+    def _find_column(self, columns, keywords):
+        """Return the first column whose name contains one of the keywords."""
+        for keyword in keywords:
+            for col in columns:
+                if keyword in col.lower():
+                    return col
+        return None
+
+    def _hash_rows(self, frame, columns):
+        """Hash each row's identity key (url + username), password and full content."""
+        frame = frame.reindex(columns=columns)
+        url_col = self._find_column(columns, ('url', 'website'))
+        user_col = self._find_column(columns, ('username', 'email'))
+        password_col = self._find_column(columns, ('password',))
+
+        # Cast numbers to float so a column inferred as int in one chunk and as
+        # float (because of blanks) in another still hashes identically
+        numeric = frame.select_dtypes('number').columns
+        content = frame.astype({col: 'float64' for col in numeric}).astype(str)
+
+        identity_hash = _identity_hash(frame, url_col, user_col)
+        content_hash = pd.util.hash_pandas_object(content, index=False).to_numpy()
+        if password_col:
+            password_hash = pd.util.hash_pandas_object(
+                frame[password_col].astype(str), index=False).to_numpy()
+        else:
+            password_hash = np.zeros(len(frame), dtype=np.uint64)
+        return identity_hash, content_hash, password_hash
+
+    def iter_diff(self, other_file, chunksize=100000):
+        """Compare the loaded export against another one, streaming the results.
+
+        The loaded data is treated as the old export. Only its row hashes are
+        kept while ``other_file`` is read chunk by chunk and hash-joined on the
+        identity key, so the newer export never has to be held in memory at once.
+        Yields ``(category, DataFrame)`` pairs where category is one of
+        ``added``, ``removed``, ``changed``, ``rotated`` or ``unchanged``.
+        Rotated entries are the subset of changed entries whose password differs.
+        """
+        columns = list(self.data.columns)
+        old_identity, old_content, old_password = self._hash_rows(self.data, columns)
+
+        # Build the hash table for the join; repeated keys are paired up in
+        # order, so the n-th occurrence of a key matches its n-th old occurrence
+        old_occurrence = pd.Series(old_identity).groupby(old_identity).cumcount().to_numpy()
+        old_index = pd.MultiIndex.from_arrays([old_identity, old_occurrence])
+        matched = np.zeros(len(self.data), dtype=bool)
+        seen = pd.Series(dtype='int64')
+
+        for chunk in self.iter_chunks(other_file, chunksize):
+            identity, content, password = self._hash_rows(chunk, columns)
+            keys = pd.Series(identity)
+            occurrence = (keys.groupby(identity).cumcount().to_numpy()
+                          + seen.reindex(identity, fill_value=0).to_numpy())
+            seen = seen.add(keys.value_counts(), fill_value=0).astype('int64')
+
+            lookup = old_index.get_indexer(pd.MultiIndex.from_arrays([identity, occurrence]))
+            found = lookup >= 0
+            positions = lookup[found]
+            matched[positions] = True
+
+            changed = np.zeros(len(chunk), dtype=bool)
+            rotated = np.zeros(len(chunk), dtype=bool)
+            changed[found] = content[found] != old_content[positions]
+            rotated[found] = password[found] != old_password[positions]
+
+            yield 'added', chunk[~found]
+            yield 'changed', chunk[changed]
+            yield 'rotated', chunk[rotated]
+            yield 'unchanged', chunk[found & ~changed]
+
+        yield 'removed', self.data[~matched]
+
+    def diff(self, other_file, chunksize=100000):
+        """Compare the loaded export against another one and count the results."""
+        result = VaultDiff()
+        for category, frame in self.iter_diff(other_file, chunksize):
+            result.add(category, frame)
+        return result
+
+    def _dedupe_keys(self, rows=None):
+        """Hash each row's normalized identity key (host without www + username).
+
+        ``rows`` restricts the keys to a subset of ``self.data``. Returns
+        ``(keys, groupable)``; rows with neither a host nor a username, such
+        as secure notes and cards, are not groupable and never merged.
+        """
+        data = self.data if rows is None else rows
+        user_col = self._email_column()
+        if self.url_parts is None:
+            url_col = self._domain_column()
+            return (_identity_hash(data, url_col, user_col),
+                    _has_identity(data, url_col, user_col))
+
+        hosts = self.url_parts['url_host']
+        hosts = (hosts if rows is None else hosts.loc[data.index]).cat
+        stripped = np.array([host[4:] if host.startswith('www.') else host
+                             for host in hosts.categories.astype(str)] + [None], dtype=object)
+        # Code -1 (missing host) picks the trailing None
+        identity = pd.DataFrame({'host': stripped[hosts.codes.to_numpy()]}, index=data.index)
+        if user_col:
+            identity['username'] = data[user_col]
+        user_col = 'username' if user_col else None
+        return _identity_hash(identity, 'host', user_col), _has_identity(identity, 'host', user_col)
+
+    def _dedupe_score(self, rule):
+        """Return a per-row score for a survivor rule; higher wins."""
+        if rule == 'newest':
+            date_col = self._find_column(self.data.columns, ('modified', 'updated', 'last_touch', 'created', 'date'))
+            if date_col:
+                dates = pd.to_datetime(self.data[date_col], errors='coerce', utc=True)
+                seconds = (dates - pd.Timestamp(0, tz='UTC')).dt.total_seconds()
+                return seconds.fillna(-np.inf).to_numpy()
+            # Without timestamps, later rows are assumed to be newer
+            return np.arange(len(self.data), dtype=float)
+        if rule == 'longest_notes':
+            notes_col = self._find_column(self.data.columns, ('notes', 'note', 'extra', 'comment'))
+            if notes_col:
+                # An all-empty notes column is read as float, so measure non-null values only
+                notes = self.data[notes_col]
+                return notes.dropna().astype(str).str.len().reindex(notes.index, fill_value=0).to_numpy(dtype=float)
+            return np.zeros(len(self.data))
+        if rule == 'most_fields':
+            filled = np.zeros(len(self.data))
+            for col in self.data.columns:
+                values = self.data[col]
+                present = values.notna()
+                if not pd.api.types.is_numeric_dtype(values):
+                    present &= values.astype(str).str.strip().ne('')
+                filled += present.to_numpy()
+            return filled
+        raise ValueError(f"Unknown dedupe rule: {rule}. Choose from: {', '.join(DEDUPE_RULES)}")
+
+    def dedupe(self, rules=('newest',)):
+        """Return the data with duplicate url + username entries merged.
+
+        Rows are grouped by a hash of their normalized identity key in linear
+        time. Within each group the survivor is picked by applying ``rules``
+        in order, each one narrowing the candidates to those with the highest
+        score; remaining ties keep the first row. Only the surviving rows are
+        copied out of the data. Rows without a url host or username are
+        always kept.
+        """
+        keys, groupable = self._dedupe_keys()
+        candidates = groupable.copy()
+
+        for rule in rules:
+            score = np.array(self._dedupe_score(rule), dtype=float)
+            score[~candidates] = -np.inf
+            best = pd.Series(score).groupby(keys).transform('max').to_numpy()
+            candidates &= score == best
+
+        positions = np.flatnonzero(candidates)
+        first = ~pd.Series(keys[positions]).duplicated(keep='first').to_numpy()
+        survivors = np.union1d(positions[first], np.flatnonzero(~groupable))
+        return self.data.iloc[survivors]
+
+    def summarize(self, data=None, top_n=10):
+        """Compute aggregate counts over the data in a single pass."""
+        if data is None:
+            data = self.data
+        # Duplicates are counted on the same identity key dedupe groups by
+        summary = VaultSummary(self._domain_column(), self._email_column(),
+                               self._find_column(self.data.columns, ('password',)), top_n,
+                               identity_keys=self._dedupe_keys)
+        summary.update(data)
+        return summary
 
     def get_available_columns(self):
         """Return list of available columns in the dataset."""
-        return list(self.data.columns)
+        columns = list(self.data.columns)
+        if self.url_parts is not None:
+            columns += [col for col in URL_COLUMNS if col not in columns]
+        return columns
 
     def analyze_data(self, columns=None):
         """Display analysis of the password data."""
-        if columns:
-            display_data = self.data[columns]
-        else:
-            display_data = self.data
+        display_data = self.select_columns(self.data, columns)
 
         table = Table(title="Password Manager Data Analysis")
         
@@ -45,36 +533,240 @@ class PasswordManagerAnalyzer:
 
         self.console.print(table)
 
-    def filter_by_domain(self, domain):
-        """Filter entries by domain/website."""
-        domain_cols = [col for col in self.data.columns if 'url' in col.lower() or 'website' in col.lower()]
-        if domain_cols:
-            filtered = self.data[self.data[domain_cols[0]].str.contains(domain, case=False, na=False)]
-            return filtered
+    def _domain_column(self):
+        """Return the column holding the website/url, if any."""
+        return _domain_column_of(self.data.columns)
+
+    def _email_column(self):
+        """Return the column holding the email/username, if any."""
+        return _email_column_of(self.data.columns)
+
+    def _fuzzy_key(self, value, is_url):
+        """Normalize a value for fuzzy matching; urls are reduced to their host."""
+        key = str(value).strip().lower()
+        if is_url:
+            key = normalize_url(key)[1] or key
+            if key.startswith('www.'):
+                key = key[4:]
+        return key
+
+    def _get_fuzzy_index(self, column):
+        """Return the normalized keys and BK-tree for a column, building them once per load."""
+        cached = self._fuzzy_index.get(column)
+        # Rebuild when self.data has been replaced, e.g. by an earlier filter
+        if cached is None or cached[0] is not self.data.index:
+            codes, uniques = pd.factorize(self.data[column])
+            is_url = column == self._domain_column()
+            unique_keys = np.array([self._fuzzy_key(value, is_url) for value in uniques], dtype=object)
+            keys = pd.Series(unique_keys[codes] if len(uniques) else None,
+                             index=self.data.index, dtype=object)
+            keys[codes < 0] = None
+            cached = (self.data.index, keys, BKTree(set(unique_keys)))
+            self._fuzzy_index[column] = cached
+        return cached[1], cached[2]
+
+    def build_fuzzy_indexes(self):
+        """Build the fuzzy search indexes of the url and email columns ahead of the first query.
+
+        Building is the slow part of fuzzy search, so front ends call this
+        off their UI thread right after loading.
+        """
+        for column in (self._domain_column(), self._email_column()):
+            if column:
+                self._get_fuzzy_index(column)
+
+    def _regex_mask(self, series, pattern):
+        """Match a case-insensitive regex against the distinct values of a column."""
+        compiled = re.compile(pattern, re.IGNORECASE)
+        codes, uniques = pd.factorize(series)
+        values = [str(value) for value in uniques]
+
+        workers = os.cpu_count() or 1
+        if len(values) >= REGEX_PARALLEL_THRESHOLD and workers > 1:
+            size = -(-len(values) // workers)
+            chunks = [values[i:i + size] for i in range(0, len(values), size)]
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                unique_mask = np.concatenate(list(executor.map(_regex_search_chunk, [compiled] * len(chunks), chunks)))
+        else:
+            unique_mask = _regex_search_chunk(compiled, values)
+
+        mask = np.zeros(len(series), dtype=bool)
+        found = codes >= 0
+        mask[found] = unique_mask[codes[found]]
+        return pd.Series(mask, index=series.index)
+
+    def _match(self, column, query, regex=False, fuzzy=None, rows=None):
+        """Return a boolean mask of the rows whose column matches the query.
+
+        ``rows`` restricts matching to a subset of ``self.data``.
+        """
+        data = self.data if rows is None else rows
+        if not regex:
+            # Surrounding whitespace, e.g. from a pasted address, is never meant to match
+            query = query.strip()
+        if fuzzy is not None:
+            keys, tree = self._get_fuzzy_index(column)
+            hits = {value for value, _ in tree.search(self._fuzzy_key(query, column == self._domain_column()), fuzzy)}
+            return keys.loc[data.index].isin(hits)
+        if regex:
+            return self._regex_mask(data[column], query)
+        return data[column].str.contains(query, case=False, na=False)
+
+    def match_filters(self, rows, domain=None, email=None, regex=False, fuzzy=None):
+        """Return the matches of each given filter within a subset of the loaded rows.
+
+        The result maps 'domain' and/or 'email' to the matching rows, like
+        ``filter_by_domain`` and ``search_by_email`` do for the whole data.
+        Used to re-run active filters on just the rows added by ``refresh``.
+        """
+        matches = {}
+        for name, query, column in (('domain', domain, self._domain_column()),
+                                    ('email', email, self._email_column())):
+            if query:
+                matches[name] = rows[self._match(column, query, regex, fuzzy, rows)] if column else rows.iloc[:0]
+        return matches
+
+    def _select_matches(self, column, query, regex=False, fuzzy=None):
+        """Return the rows matching a query, using the query cache when available.
+
+        Cached results are row positions in the data as loaded, so the cache
+        is bypassed once ``self.data`` has been replaced, e.g. by a filter.
+        """
+        if self.cache is None or self.data.index is not self._loaded_index:
+            return self.data[self._match(column, query, regex, fuzzy)]
+
+        mode = 'fuzzy' if fuzzy is not None else 'regex' if regex else 'contains'
+        # Queries that match the same rows share an entry
+        key = ('match', column, mode, fuzzy, query if mode == 'regex' else query.strip().lower())
+        positions = self.cache.get(self.fingerprint, key)
+        if positions is None:
+            positions = np.flatnonzero(self._match(column, query, regex, fuzzy).to_numpy())
+            self.cache.put(self.fingerprint, key, positions)
+        return self.data.iloc[positions]
+
+    def filter_by_domain(self, domain, regex=False, fuzzy=None):
+        """Filter entries by domain/website.
+
+        With ``regex`` the domain is a case-insensitive regular expression; with
+        ``fuzzy`` set, hosts within that edit distance of the domain match.
+        """
+        domain_col = self._domain_column()
+        if domain_col:
+            return self._select_matches(domain_col, domain, regex, fuzzy)
         return pd.DataFrame()
 
-    def search_by_email(self, email):
-        """Search for entries containing specific email."""
-        email_cols = [col for col in self.data.columns if 'email' in col.lower() or 'username' in col.lower()]
-        if email_cols:
-            filtered = self.data[self.data[email_cols[0]].str.contains(email, case=False, na=False)]
-            return filtered
+    def search_by_email(self, email, regex=False, fuzzy=None):
+        """Search for entries containing specific email.
+
+        ``regex`` and ``fuzzy`` behave as in ``filter_by_domain``.
+        """
+        email_col = self._email_column()
+        if email_col:
+            return self._select_matches(email_col, email, regex, fuzzy)
         return pd.DataFrame()
 
+
+def _domain_column_of(columns):
+    """Return the first column name that looks like a website/url."""
+    domain_cols = [col for col in columns if 'url' in col.lower() or 'website' in col.lower()]
+    return domain_cols[0] if domain_cols else None
+
+
+def _email_column_of(columns):
+    """Return the first column name that looks like an email/username."""
+    email_cols = [col for col in columns if 'email' in col.lower() or 'username' in col.lower()]
+    return email_cols[0] if email_cols else None
+
+
+def _url_domain(url):
+    """Return the registrable domain of a URL, falling back to its host."""
+    _, host, _, domain, _ = normalize_url(url)
+    return domain or host
+
+
+def _count_by(series, normalize):
+    """Count rows per normalized key, normalizing each distinct value only once."""
+    codes, uniques = pd.factorize(series)
+    counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    keys = normalize(pd.Series(np.asarray(uniques, dtype=object), dtype=object))
+    return pd.Series(counts, index=pd.Index(keys, dtype=object)).groupby(level=0).sum()
+
+
+def _identity_hash(frame, url_col, user_col):
+    """Hash each row's normalized identity key (url + username)."""
+    identity = pd.DataFrame({
+        'url': frame[url_col] if url_col else '',
+        'username': frame[user_col] if user_col else '',
+    }, index=frame.index).astype(object).fillna('').astype(str)
+    identity = identity.apply(lambda col: col.str.strip().str.lower())
+    return pd.util.hash_pandas_object(identity, index=False).to_numpy()
+
+
+def _hash_file_range(digest, file_path, start, end):
+    """Feed bytes ``start`` to ``end`` of a file into a hash object."""
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(WATCH_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            digest.update(block)
+            remaining -= len(block)
+    return digest
+
+
+def _prefix_digest(file_path, length):
+    """Return a hash object fed the first ``length`` bytes of a file."""
+    return _hash_file_range(hashlib.blake2b(digest_size=16), file_path, 0, length)
+
+
+def _url_parts_of(urls):
+    """Return the derived url columns for a categorical url Series."""
+    parts = [normalize_url(url) for url in urls.cat.categories]
+    codes_of_urls = urls.cat.codes.to_numpy()
+
+    columns = {}
+    for i, name in enumerate(URL_COLUMNS):
+        component_codes, components = pd.factorize(
+            pd.Series([part[i] for part in parts], dtype=object))
+        codes = np.where(codes_of_urls >= 0, component_codes[codes_of_urls], -1)
+        columns[name] = pd.Categorical.from_codes(codes, categories=components)
+    return pd.DataFrame(columns, index=urls.index)
+
+
+def _has_identity(frame, url_col, user_col):
+    """Return which rows have a non-empty url or username to be identified by."""
+    present = np.zeros(len(frame), dtype=bool)
+    for col in (url_col, user_col):
+        if col:
+            values = frame[col].astype(object)
+            present |= (values.notna() & values.astype(str).str.strip().ne('')).to_numpy()
+    return present
+
+
+def _regex_search_chunk(compiled, values):
+    """Return which values match a compiled regex; runs in worker processes."""
+    return np.fromiter((compiled.search(value) is not None for value in values), dtype=bool, count=len(values))
+
 def main():
     parser = argparse.ArgumentParser(description='Password Manager Export Analyzer')
-    parser.add_argument('file', help='Path to the password manager export file (CSV)')
+    parser.add_argument('file', help='Path to the password manager export file (CSV, Bitwarden JSON, KeePass XML or 1Password 1PUX)')
     parser.add_argument('--columns', nargs='+', help='Specific columns to display')
     parser.add_argument('--domain', help='Filter by domain/website')
     parser.add_argument('--email', help='Search by email/username')
+    match_group = parser.add_mutually_exclusive_group()
+    match_group.add_argument('--regex', action='store_true', help='Treat --domain and --email as regular expressions')
+    match_group.add_argument('--fuzzy', type=int, metavar='N', help='Match --domain and --email within edit distance N')
     
     args = parser.parse_args()
 
     try:
-        analyzer = PasswordManagerAnalyzer(args.file)
+        filters = [name for name in ('domain', 'email') if getattr(args, name)]
+        analyzer = PasswordManagerAnalyzer(args.file, args.columns, filters)
         
         if args.domain:
-            filtered_data = analyzer.filter_by_domain(args.domain)
+            filtered_data = analyzer.filter_by_domain(args.domain, args.regex, args.fuzzy)
             if not filtered_data.empty:
                 rprint(f"\n[green]Entries matching domain '{args.domain}':[/green]")
                 analyzer.data = filtered_data
@@ -83,7 +775,7 @@ def main():
                 return
 
         if args.email:
-            filtered_data = analyzer.search_by_email(args.email)
+            filtered_data = analyzer.search_by_email(args.email, args.regex, args.fuzzy)
             if not filtered_data.empty:
                 rprint(f"\n[green]Entries matching email '{args.email}':[/green]")
                 analyzer.data = filtered_data
@@ -93,7 +785,7 @@ def main():
 
         if args.columns:
             available_cols = analyzer.get_available_columns()
-            valid_cols = [col for col in args.columns if col.lower() in [c.lower() for c in available_cols]]
+            valid_cols = [col.lower() for col in args.columns if col.lower() in [c.lower() for c in available_cols]]
             if not valid_cols:
                 rprint(f"\n[red]No valid columns specified. Available columns: {', '.join(available_cols)}[/red]")
                 return
@@ -1,11 +1,49 @@
 import argparse
+import re
 import sys
+import time
 from pathlib import Path
+import pandas as pd
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
 from rich.table import Table
-from password_analyzer import PasswordManagerAnalyzer
+from password_analyzer import DEDUPE_RULES, PREVIEW_ROWS, PasswordManagerAnalyzer, VaultDiff
 from config_manager import ConfigManager
+from query_cache import QueryCache
+
+class ChunkedExport:
+    """Export file written one DataFrame chunk at a time."""
+
+    def __init__(self, path, format_):
+        self.path = Path(path)
+        self.format = format_
+        self.rows = 0
+        self.excel = None
+
+    def write(self, data):
+        """Append the rows of a chunk to the file."""
+        if self.format == 'csv':
+            data.to_csv(self.path, mode='a' if self.rows else 'w', header=not self.rows, index=False)
+        elif self.format == 'json':
+            # Chunks are spliced into a single array of records
+            records = data.to_json(orient='records', indent=2)[1:-1].strip('\n')
+            with open(self.path, 'a' if self.rows else 'w', encoding='utf-8') as f:
+                f.write((',\n' if self.rows else '[\n') + records)
+        elif self.format == 'excel':
+            if self.excel is None:
+                self.excel = pd.ExcelWriter(self.path)
+            data.to_excel(self.excel, index=False, header=not self.rows,
+                          startrow=self.rows + 1 if self.rows else 0)
+        self.rows += len(data)
+
+    def close(self):
+        """Finish the file."""
+        if self.format == 'json' and self.rows:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n]')
+        elif self.excel is not None:
+            self.excel.close()
+
 
 class PasswordAnalyzerCLI:
     def __init__(self):
@@ -15,21 +53,55 @@ class PasswordAnalyzerCLI:
 
     def setup_cli(self):
         parser = argparse.ArgumentParser(description='Password Manager Export Analyzer CLI')
-        parser.add_argument('file', help='Path to the password manager export file (CSV)')
+        parser.add_argument('file', help='Path to the password manager export file (CSV, Bitwarden JSON, KeePass XML or 1Password 1PUX)')
         parser.add_argument('--interactive', '-i', action='store_true', 
                           help='Run in interactive mode')
         parser.add_argument('--domain', help='Filter by domain/website')
         parser.add_argument('--email', help='Search by email/username')
         parser.add_argument('--columns', nargs='+', help='Specific columns to display')
+        match_group = parser.add_mutually_exclusive_group()
+        match_group.add_argument('--regex', action='store_true',
+                          help='Treat --domain and --email as regular expressions')
+        match_group.add_argument('--fuzzy', type=int, metavar='N',
+                          help='Match --domain and --email within edit distance N')
+        parser.add_argument('--summary', action='store_true',
+                          help='Show aggregate counts instead of every entry')
+        parser.add_argument('--top', type=int, default=10, metavar='N',
+                          help='Number of entries in the summary top lists (default: 10)')
+        parser.add_argument('--dedupe', nargs='*', choices=DEDUPE_RULES, metavar='RULE',
+                          help='Merge duplicate url + username entries, keeping the survivor chosen by '
+                               f"the given rules in order ({', '.join(DEDUPE_RULES)}; default: newest)")
+        parser.add_argument('--watch', action='store_true',
+                          help='Keep running and show entries added to the export as it changes')
+        parser.add_argument('--watch-interval', type=float, default=2.0, metavar='SECONDS',
+                          help='Seconds between checks for changes in watch mode (default: 2)')
+        parser.add_argument('--preview', type=int, nargs='?', const=PREVIEW_ROWS, metavar='N',
+                          help=f'Show the first N entries (default: {PREVIEW_ROWS}) while the rest of the export loads')
+        parser.add_argument('--no-cache', action='store_true',
+                          help='Do not read or store cached query results')
         parser.add_argument('--export', help='Export results to file')
         parser.add_argument('--format', choices=['csv', 'json', 'excel'], 
                           help='Export format (default: from config)')
+        parser.add_argument('--diff', metavar='OTHER_FILE',
+                          help='Compare against a newer export and show added, removed, changed and rotated entries')
         
-        return parser.parse_args()
+        args = parser.parse_args()
+        # Rows picked up while watching are not deduplicated against the loaded ones
+        if args.watch and args.dedupe is not None:
+            parser.error('--watch cannot be combined with --dedupe')
+        return args
 
-    def load_file(self, file_path):
+    def create_query_cache(self):
+        """Create the query result cache from the configured settings."""
+        settings = self.config.get_query_cache_settings()
+        if not settings['enabled']:
+            return None
+        return QueryCache(memory_entries=settings['memory_entries'],
+                          max_disk_bytes=settings['max_disk_mb'] * 1024 * 1024)
+
+    def load_file(self, file_path, columns=None, filters=(), cache=None):
         try:
-            self.analyzer = PasswordManagerAnalyzer(file_path)
+            self.analyzer = PasswordManagerAnalyzer(file_path, columns, filters, cache)
             if self.analyzer.data.empty:
                 self.console.print("[red]No data found in the file[/red]")
                 return False
@@ -133,14 +205,11 @@ class PasswordAnalyzerCLI:
         except Exception as e:
             self.console.print(f"[red]Error exporting data: {str(e)}[/red]")
 
-    def display_results(self, data, columns=None):
+    def display_results(self, data, columns=None, title="Password Manager Data Analysis"):
         """Display results in a table."""
-        if columns:
-            display_data = data[columns]
-        else:
-            display_data = data
+        display_data = self.analyzer.select_columns(data, columns)
 
-        table = Table(title="Password Manager Data Analysis")
+        table = Table(title=title)
         
         for col in display_data.columns:
             table.add_column(col.title(), style="cyan")
@@ -150,49 +219,269 @@ class PasswordAnalyzerCLI:
 
         self.console.print(table)
 
+    def display_preview(self, args, columns=None, filters=()):
+        """Show the first entries of the export, flagged as partial, before the full load."""
+        try:
+            self.analyzer = PasswordManagerAnalyzer(args.file, columns, filters, nrows=args.preview)
+            preview = self.analyzer.data
+            if not args.interactive:
+                # Same rule as apply_filters, applied to the preview rows only
+                options = {'domain': args.domain, 'email': args.email}
+                matches = self.analyzer.match_filters(preview, args.domain, args.email, args.regex, args.fuzzy)
+                deciding = self.deciding_filter(options, {name: not frame.empty for name, frame in matches.items()})
+                if deciding is None:
+                    preview = preview.iloc[:0]
+                elif deciding != 'all':
+                    preview = matches[deciding]
+        except Exception:
+            # Errors are reported by the full load
+            return
+
+        # A small export is loaded completely right away, so there is nothing to preview
+        if self.analyzer.complete:
+            return
+
+        if preview.empty:
+            self.console.print(f"[yellow]No matches in the first {len(self.analyzer.data)} entries yet[/yellow]")
+            return
+
+        display_columns = [col.lower() for col in args.columns] if args.columns else None
+        self.display_results(preview, display_columns,
+                             title=f"Preview (partial: first {len(self.analyzer.data)} entries)")
+
+    def display_summary(self, summary):
+        """Display aggregate counts and top lists."""
+        overview = Table(title="Password Manager Summary")
+        overview.add_column("Metric", style="cyan")
+        overview.add_column("Count", style="magenta", justify="right")
+        for metric, count in summary.overview().items():
+            overview.add_row(metric, str(count))
+        self.console.print(overview)
+
+        for title, label, counts in (("Top Domains", "Domain", summary.top_domains()),
+                                     ("Top Accounts", "Account", summary.top_accounts())):
+            if counts.empty:
+                continue
+            table = Table(title=title)
+            table.add_column(label, style="cyan")
+            table.add_column("Entries", style="magenta", justify="right")
+            for key, count in counts.items():
+                table.add_row(str(key), str(count))
+            self.console.print(table)
+
+    def display_diff_summary(self, diff):
+        """Display the per-category counts of a vault diff."""
+        table = Table(title="Export Diff Summary")
+        table.add_column("Category", style="cyan")
+        table.add_column("Entries", style="magenta", justify="right")
+
+        for category, count in diff.summary().items():
+            table.add_row(category.title(), str(count))
+
+        self.console.print(table)
+
+    def run_diff(self, other_file, export_path=None, format_=None):
+        """Compare the loaded export against another one.
+
+        With ``export_path`` the rows of each category are written to their
+        own file, e.g. results_added.csv, chunk by chunk as the diff streams.
+        """
+        diff = VaultDiff()
+        writers = {}
+        try:
+            for category, frame in self.analyzer.iter_diff(other_file):
+                diff.add(category, frame)
+                if export_path and category != 'unchanged' and not frame.empty:
+                    if category not in writers:
+                        path = Path(export_path)
+                        writers[category] = ChunkedExport(
+                            path.with_name(f"{path.stem}_{category}{path.suffix}"), format_)
+                    writers[category].write(frame)
+        except Exception as e:
+            self.console.print(f"[red]Error comparing exports: {str(e)}[/red]")
+            return
+        finally:
+            for writer in writers.values():
+                writer.close()
+
+        self.display_diff_summary(diff)
+        for writer in writers.values():
+            self.console.print(f"[green]Data exported to {writer.path}[/green]")
+
     def run(self):
         args = self.setup_cli()
+
+        # Only read the displayed columns when nothing else needs the full rows
+        columns, filters = None, ()
+        full_rows = args.interactive or args.diff or args.summary or args.export or args.dedupe is not None
+        if args.columns and not full_rows:
+            columns = args.columns
+            filters = [name for name in ('domain', 'email') if getattr(args, name)]
         
-        if not self.load_file(args.file):
+        cache = None if args.no_cache else self.create_query_cache()
+        if args.preview and not args.diff:
+            self.display_preview(args, columns, filters)
+            with self.console.status("[cyan]Loading the full export...[/cyan]"):
+                loaded = self.load_file(args.file, columns, filters, cache)
+        else:
+            loaded = self.load_file(args.file, columns, filters, cache)
+        if not loaded:
+            return
+
+        if args.diff:
+            self.run_diff(args.diff, args.export, args.format or self.config.get_export_format())
             return
 
+        if args.dedupe is not None:
+            try:
+                deduped = self.analyzer.dedupe(args.dedupe or ['newest'])
+            except Exception as e:
+                self.console.print(f"[red]Error removing duplicates: {str(e)}[/red]")
+                return
+            removed = len(self.analyzer.data) - len(deduped)
+            self.console.print(f"[green]Removed {removed} duplicate entries[/green]")
+            self.analyzer.data = deduped
+
         if args.interactive:
             options = self.interactive_mode()
         else:
             options = {
                 'domain': args.domain,
                 'email': args.email,
-                'columns': args.columns,
+                'columns': [col.lower() for col in args.columns] if args.columns else None,
                 'export': args.export,
                 'format': args.format or self.config.get_export_format()
             }
 
-        # Apply filters
-        filtered_data = self.analyzer.data.copy()
-        
-        if options['domain']:
-            domain_filtered = self.analyzer.filter_by_domain(options['domain'])
-            if not domain_filtered.empty:
-                filtered_data = domain_filtered
-            else:
-                self.console.print(f"\n[yellow]No entries found for domain '{options['domain']}'[/yellow]")
-                return
-
-        if options['email']:
-            email_filtered = self.analyzer.search_by_email(options['email'])
-            if not email_filtered.empty:
-                filtered_data = email_filtered
-            else:
-                self.console.print(f"\n[yellow]No entries found for email '{options['email']}'[/yellow]")
-                return
+        filtered_data = self.apply_filters(options, args)
+        if filtered_data is None:
+            return
 
         # Display results
-        self.display_results(filtered_data, options['columns'])
+        if args.summary:
+            self.display_summary(self.analyzer.summarize(filtered_data, args.top))
+        elif not filtered_data.empty:
+            self.display_results(filtered_data, options['columns'])
 
         # Export if requested
         if options['export']:
             self.export_data(filtered_data, options['export'], options['format'])
 
+        if args.watch:
+            self.watch(options, args, filtered_data)
+
+    def apply_filters(self, options, args):
+        """Apply the domain and email filters, returning None when there is nothing to show."""
+        filtered_data = self.analyzer.data.copy()
+        
+        if args.regex:
+            for pattern in (options['domain'], options['email']):
+                try:
+                    if pattern:
+                        re.compile(pattern)
+                except re.error as e:
+                    self.console.print(f"[red]Invalid regular expression '{pattern}': {str(e)}[/red]")
+                    return None
+
+        matches = {}
+        if options['domain']:
+            matches['domain'] = self.analyzer.filter_by_domain(options['domain'], args.regex, args.fuzzy)
+        if options['email']:
+            matches['email'] = self.analyzer.search_by_email(options['email'], args.regex, args.fuzzy)
+
+        self.filters_found = {name: not frame.empty for name, frame in matches.items()}
+        for name, frame in matches.items():
+            if frame.empty:
+                self.console.print(f"\n[yellow]No entries found for {name} '{options[name]}'[/yellow]")
+
+        deciding = self.deciding_filter(options, self.filters_found)
+        if deciding is None:
+            # Keep watching for matching entries that get added later
+            return self.analyzer.data.iloc[:0] if args.watch else None
+        if deciding == 'all':
+            return filtered_data
+        return matches[deciding]
+
+    def deciding_filter(self, options, found):
+        """Return which filter's matches are shown: 'domain', 'email', 'all', or None for nothing.
+
+        The last given filter decides, provided every given filter matches some entry.
+        """
+        given = [name for name in ('domain', 'email') if options[name]]
+        if not all(found[name] for name in given):
+            return None
+        return given[-1] if given else 'all'
+
+    def filter_appended(self, rows, options, args):
+        """Apply the filters to appended rows the same way ``apply_filters`` does.
+
+        Returns None when a filter matched for the first time, which changes
+        what is shown for the whole export, so it has to be filtered again.
+        """
+        matches = self.analyzer.match_filters(rows, options['domain'], options['email'],
+                                              args.regex, args.fuzzy)
+        deciding = self.deciding_filter(options, self.filters_found)
+        for name, frame in matches.items():
+            self.filters_found[name] = self.filters_found[name] or not frame.empty
+        if self.deciding_filter(options, self.filters_found) != deciding:
+            return None
+
+        if deciding is None:
+            return rows.iloc[:0]
+        return rows if deciding == 'all' else matches[deciding]
+
+    def watch(self, options, args, filtered_data):
+        """Follow the export and show entries added to it that match the active filters.
+
+        Appended rows are parsed on their own and only they are filtered; a
+        rewritten export is reloaded and filtered from scratch.
+        """
+        summary = self.analyzer.summarize(filtered_data, args.top) if args.summary else None
+        self.console.print(f"\n[cyan]Watching {args.file} for changes (Ctrl+C to stop)[/cyan]")
+
+        try:
+            while True:
+                time.sleep(args.watch_interval)
+                try:
+                    status, rows = self.analyzer.refresh()
+                except Exception as e:
+                    # The export may be missing or half written while it is being replaced
+                    self.console.print(f"[red]Error reading {args.file}: {str(e)}, retrying[/red]")
+                    continue
+
+                if status == 'unchanged':
+                    continue
+
+                matches = self.filter_appended(rows, options, args) if status == 'appended' else None
+                if status == 'appended' and matches is None:
+                    self.console.print(f"\n[green]{len(rows)} new entries, filtering again[/green]")
+
+                if matches is None:
+                    if status == 'reloaded':
+                        self.console.print("\n[yellow]Export was rewritten, reloading[/yellow]")
+                    filtered_data = self.apply_filters(options, args)
+                    if filtered_data is None:
+                        filtered_data = self.analyzer.data.iloc[:0]
+                    if summary:
+                        summary = self.analyzer.summarize(filtered_data, args.top)
+                        self.display_summary(summary)
+                    elif not filtered_data.empty:
+                        self.display_results(filtered_data, options['columns'])
+
+                else:
+                    self.console.print(f"\n[green]{len(rows)} new entries, {len(matches)} matching[/green]")
+                    filtered_data = pd.concat([filtered_data, matches])
+                    if summary:
+                        summary.update(matches)
+                        self.display_summary(summary)
+                    elif not matches.empty:
+                        self.display_results(matches, options['columns'])
+
+                if options['export']:
+                    self.export_data(filtered_data, options['export'], options['format'])
+        except KeyboardInterrupt:
+            self.console.print("\n[cyan]Stopped watching[/cyan]")
+
 def main():
     cli = PasswordAnalyzerCLI()
     cli.run()
@@ -1,11 +1,21 @@
+import multiprocessing
+import queue
+import re
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import pandas as pd
 from pathlib import Path
-from password_analyzer import PasswordManagerAnalyzer
+from password_analyzer import PREVIEW_ROWS, PasswordManagerAnalyzer
 import ttkthemes
 from operator import itemgetter
 
+# Milliseconds between checks for file changes when auto-refresh is on
+AUTO_REFRESH_MS = 2000
+
+# Milliseconds between checks whether a background load has finished
+LOAD_POLL_MS = 100
+
 class PasswordAnalyzerGUI:
     def __init__(self, root):
         self.root = root
@@ -17,6 +27,12 @@ class PasswordAnalyzerGUI:
         self.style.set_theme("arc")  # Modern looking theme
         
         self.analyzer = None
+        self.summary = None
+        self.active_filters = ("", "", False, None)
+        self.filters_found = {}
+        self.refresh_job = None
+        self.load_results = queue.Queue()
+        self.load_id = 0
         self.sort_column = None
         self.sort_reverse = False
         self.setup_gui()
@@ -39,6 +55,14 @@ class PasswordAnalyzerGUI:
         browse_btn = ttk.Button(file_frame, text="Browse", command=self.browse_file)
         browse_btn.grid(row=0, column=1, padx=5)
 
+        self.auto_refresh_var = tk.BooleanVar(value=False)
+        auto_refresh = ttk.Checkbutton(file_frame, text="Auto-refresh", variable=self.auto_refresh_var,
+                                       command=self.toggle_auto_refresh)
+        auto_refresh.grid(row=0, column=2, padx=5)
+
+        self.load_status_var = tk.StringVar()
+        ttk.Label(file_frame, textvariable=self.load_status_var).grid(row=0, column=3, padx=5)
+
         # Search filters
         filter_frame = ttk.LabelFrame(main_frame, text="Search Filters", padding="5")
         filter_frame.grid(row=1, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=5)
@@ -53,8 +77,20 @@ class PasswordAnalyzerGUI:
         self.email_entry = ttk.Entry(filter_frame, textvariable=self.email_var)
         self.email_entry.grid(row=0, column=3, padx=5)
 
+        ttk.Label(filter_frame, text="Match:").grid(row=0, column=4, padx=5)
+        self.match_mode_var = tk.StringVar(value="Contains")
+        match_mode = ttk.Combobox(filter_frame, textvariable=self.match_mode_var,
+                                  values=["Contains", "Regex", "Fuzzy"], state="readonly", width=9)
+        match_mode.grid(row=0, column=5, padx=5)
+
+        ttk.Label(filter_frame, text="Max distance:").grid(row=0, column=6, padx=5)
+        self.fuzzy_distance_var = tk.IntVar(value=2)
+        fuzzy_distance = ttk.Spinbox(filter_frame, from_=0, to=10, width=4,
+                                     textvariable=self.fuzzy_distance_var)
+        fuzzy_distance.grid(row=0, column=7, padx=5)
+
         search_btn = ttk.Button(filter_frame, text="Search", command=self.search)
-        search_btn.grid(row=0, column=4, padx=5)
+        search_btn.grid(row=0, column=8, padx=5)
 
         # Column selection
         columns_frame = ttk.LabelFrame(main_frame, text="Columns", padding="5")
@@ -63,9 +99,20 @@ class PasswordAnalyzerGUI:
         self.columns_listbox = tk.Listbox(columns_frame, selectmode=tk.MULTIPLE, height=10)
         self.columns_listbox.pack(fill=tk.BOTH, expand=True)
 
+        # Summary of the current results
+        summary_frame = ttk.LabelFrame(main_frame, text="Summary", padding="5")
+        summary_frame.grid(row=3, column=0, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
+
+        self.summary_tree = ttk.Treeview(summary_frame, columns=("count",), height=8)
+        self.summary_tree.heading("#0", text="Metric")
+        self.summary_tree.heading("count", text="Count")
+        self.summary_tree.column("#0", width=160)
+        self.summary_tree.column("count", width=60, anchor=tk.E)
+        self.summary_tree.pack(fill=tk.BOTH, expand=True)
+
         # Results section with export button
-        results_frame = ttk.LabelFrame(main_frame, text="Results", padding="5")
-        results_frame.grid(row=2, column=1, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
+        self.results_frame = results_frame = ttk.LabelFrame(main_frame, text="Results", padding="5")
+        results_frame.grid(row=2, column=1, rowspan=2, sticky=(tk.W, tk.E, tk.N, tk.S), pady=5)
         
         # Add export button above results
         export_btn = ttk.Button(results_frame, text="Export Results", command=self.export_results)
@@ -83,27 +130,81 @@ class PasswordAnalyzerGUI:
         # Configure grid weights
         main_frame.columnconfigure(1, weight=3)
         main_frame.rowconfigure(2, weight=1)
+        main_frame.rowconfigure(3, weight=1)
 
     def browse_file(self):
         filename = filedialog.askopenfilename(
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+            filetypes=[
+                ("Password exports", "*.csv *.json *.xml *.1pux"),
+                ("CSV files", "*.csv"),
+                ("Bitwarden JSON", "*.json"),
+                ("KeePass XML", "*.xml"),
+                ("1Password export", "*.1pux"),
+                ("All files", "*.*")
+            ]
         )
         if filename:
             self.file_path.set(filename)
             self.load_file()
 
     def load_file(self):
+        """Show the first rows right away and load the rest of the file in the background."""
+        file_path = self.file_path.get()
+        # Supersedes any file still loading in the background
+        self.load_id += 1
+        self.load_status_var.set("")
         try:
-            self.analyzer = PasswordManagerAnalyzer(self.file_path.get())
+            self.analyzer = PasswordManagerAnalyzer(file_path, nrows=PREVIEW_ROWS)
             self.update_columns_list()
             self.search()  # Initial display of data
         except Exception as e:
             messagebox.showerror("Error", str(e))
+            return
+
+        if not self.analyzer.complete:
+            self.load_status_var.set("Loading full file...")
+            worker = threading.Thread(target=self.load_full_file, args=(file_path, self.load_id), daemon=True)
+            worker.start()
+            self.root.after(LOAD_POLL_MS, self.check_full_load)
+
+    def load_full_file(self, file_path, load_id):
+        """Load the whole file; runs on a worker thread and hands the result to the UI thread."""
+        try:
+            analyzer = PasswordManagerAnalyzer(file_path)
+            analyzer.build_fuzzy_indexes()
+            self.load_results.put((load_id, analyzer))
+        except Exception as e:
+            self.load_results.put((load_id, e))
+
+    def check_full_load(self):
+        """Swap in the fully loaded data once the background load is done."""
+        try:
+            load_id, result = self.load_results.get_nowait()
+        except queue.Empty:
+            self.root.after(LOAD_POLL_MS, self.check_full_load)
+            return
+
+        # Results of a file that has since been replaced are dropped
+        if load_id != self.load_id:
+            return
+
+        self.load_status_var.set("")
+        if isinstance(result, Exception):
+            messagebox.showerror("Error", str(result))
+            return
+
+        self.analyzer = result
+        self.update_columns_list()
+        self.search()
 
     def update_columns_list(self):
+        # Keep the selection when the columns are refreshed for the same file
+        selected = set(self.get_selected_columns() or ())
         self.columns_listbox.delete(0, tk.END)
         for column in self.analyzer.get_available_columns():
             self.columns_listbox.insert(tk.END, column)
+            if column in selected:
+                self.columns_listbox.selection_set(tk.END)
 
     def get_selected_columns(self):
         selected_indices = self.columns_listbox.curselection()
@@ -116,21 +217,130 @@ class PasswordAnalyzerGUI:
             messagebox.showwarning("Warning", "Please load a file first")
             return
 
+        match_options = self.get_match_options()
+        if match_options is None:
+            return
+        regex, fuzzy = match_options
+
         # Apply filters
         filtered_data = self.analyzer.data.copy()
+        found = {}
         
-        if self.domain_var.get():
-            domain_filtered = self.analyzer.filter_by_domain(self.domain_var.get())
-            if not domain_filtered.empty:
-                filtered_data = domain_filtered
+        try:
+            if self.domain_var.get():
+                domain_filtered = self.analyzer.filter_by_domain(self.domain_var.get(), regex, fuzzy)
+                found['domain'] = not domain_filtered.empty
+                if not domain_filtered.empty:
+                    filtered_data = domain_filtered
 
-        if self.email_var.get():
-            email_filtered = self.analyzer.search_by_email(self.email_var.get())
-            if not email_filtered.empty:
-                filtered_data = email_filtered
+            if self.email_var.get():
+                email_filtered = self.analyzer.search_by_email(self.email_var.get(), regex, fuzzy)
+                found['email'] = not email_filtered.empty
+                if not email_filtered.empty:
+                    filtered_data = email_filtered
+        except re.error as e:
+            messagebox.showerror("Error", f"Invalid regular expression: {str(e)}")
+            return
+
+        # Remembered so rows added by auto-refresh are filtered the same way
+        self.active_filters = (self.domain_var.get(), self.email_var.get(), regex, fuzzy)
+        self.filters_found = found
 
         # Update treeview
         self.update_treeview(filtered_data)
+        self.update_summary(filtered_data)
+
+        # Searches run while the file is still loading only cover the preview rows
+        if self.analyzer.complete:
+            self.results_frame.configure(text="Results")
+        else:
+            self.results_frame.configure(
+                text=f"Results (partial: first {len(self.analyzer.data)} entries, still loading)")
+
+    def get_match_options(self):
+        """Return (regex, fuzzy) for the selected match mode, or None if invalid."""
+        mode = self.match_mode_var.get()
+        try:
+            fuzzy = self.fuzzy_distance_var.get() if mode == "Fuzzy" else None
+        except tk.TclError:
+            messagebox.showerror("Error", "Max distance must be a whole number")
+            return None
+        return mode == "Regex", fuzzy
+
+    def toggle_auto_refresh(self):
+        """Start or stop polling the loaded file for changes."""
+        if self.auto_refresh_var.get():
+            if self.refresh_job is None:
+                self.refresh_job = self.root.after(AUTO_REFRESH_MS, self.poll_file)
+        elif self.refresh_job is not None:
+            self.root.after_cancel(self.refresh_job)
+            self.refresh_job = None
+
+    def poll_file(self):
+        """Pick up changes to the loaded file, filtering only the rows that were added."""
+        self.refresh_job = None
+        if not self.auto_refresh_var.get():
+            return
+
+        # A file still loading in the background is picked up once it is complete
+        if self.analyzer and self.analyzer.complete:
+            try:
+                status, rows = self.analyzer.refresh()
+            except Exception as e:
+                self.auto_refresh_var.set(False)
+                messagebox.showerror("Error", f"Auto-refresh stopped: {str(e)}")
+                return
+
+            if status == 'reloaded':
+                self.update_columns_list()
+                self.search()
+            elif status == 'appended':
+                matches = self.filter_appended(rows)
+                if matches is None:
+                    self.search()
+                else:
+                    self.append_to_treeview(matches)
+                    self.summary.update(matches)
+                    self.render_summary()
+
+        self.refresh_job = self.root.after(AUTO_REFRESH_MS, self.poll_file)
+
+    def deciding_filter(self, found):
+        """Return the filter whose matches are shown, or 'all'; as in search, the last one with matches wins."""
+        matched = [name for name in ('domain', 'email') if found.get(name)]
+        return matched[-1] if matched else 'all'
+
+    def filter_appended(self, rows):
+        """Apply the filters of the last search to appended rows.
+
+        Returns None when a filter matched for the first time, which changes
+        what search shows for the whole file, so it has to run again.
+        """
+        matches = self.analyzer.match_filters(rows, *self.active_filters)
+        if any(not frame.empty and not self.filters_found.get(name) for name, frame in matches.items()):
+            return None
+
+        deciding = self.deciding_filter(self.filters_found)
+        return rows if deciding == 'all' else matches[deciding]
+
+    def update_summary(self, data):
+        """Show aggregate counts for the given data in the summary pane."""
+        self.summary = self.analyzer.summarize(data)
+        self.render_summary()
+
+    def render_summary(self):
+        """Fill the summary pane from the current summary."""
+        self.summary_tree.delete(*self.summary_tree.get_children())
+        summary = self.summary
+
+        for metric, count in summary.overview().items():
+            self.summary_tree.insert("", tk.END, text=metric, values=(count,))
+
+        for title, counts in (("Top Domains", summary.top_domains()),
+                              ("Top Accounts", summary.top_accounts())):
+            parent = self.summary_tree.insert("", tk.END, text=title, open=False)
+            for key, count in counts.items():
+                self.summary_tree.insert(parent, tk.END, text=str(key), values=(count,))
 
     def treeview_sort_column(self, col, reverse):
         """Sort treeview content when a column header is clicked."""
@@ -170,10 +380,7 @@ class PasswordAnalyzerGUI:
 
         # Get selected columns or use all columns
         selected_columns = self.get_selected_columns()
-        if selected_columns:
-            display_data = data[selected_columns]
-        else:
-            display_data = data
+        display_data = self.analyzer.select_columns(data, selected_columns)
 
         # Configure columns
         self.tree["columns"] = list(display_data.columns)
@@ -190,6 +397,15 @@ class PasswordAnalyzerGUI:
         if self.sort_column and self.sort_column in display_data.columns:
             self.treeview_sort_column(self.sort_column, self.sort_reverse)
 
+    def append_to_treeview(self, data):
+        """Add rows to the results without rebuilding the table."""
+        display_data = self.analyzer.select_columns(data, list(self.tree["columns"]))
+        for idx, row in display_data.iterrows():
+            self.tree.insert("", tk.END, values=list(row))
+
+        if self.sort_column and self.sort_column in display_data.columns:
+            self.treeview_sort_column(self.sort_column, self.sort_reverse)
+
     def export_results(self):
         if not self.analyzer or not self.tree.get_children():
             messagebox.showwarning("Warning", "No data to export")
@@ -235,6 +451,7 @@ class PasswordAnalyzerGUI:
         return pd.DataFrame(data)
 
 def main():
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = PasswordAnalyzerGUI(root)
     root.mainloop()
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import shutil
+from collections import OrderedDict
+from pathlib import Path
+import numpy as np
+
+# Bump when matching semantics change so older cached results are ignored
+CACHE_VERSION = 1
+
+# Bytes sampled from the start and end of an export for its fingerprint
+FINGERPRINT_SAMPLE_SIZE = 64 * 1024
+
+
+class QueryCache:
+    """Cache of query results keyed by export fingerprint and normalized query.
+
+    Only the positions of the matching rows are stored, never the data. An
+    in-memory LRU sits in front of an on-disk store that is trimmed to
+    ``max_disk_bytes``, least recently used entries first. Results for an
+    export are dropped as soon as its fingerprint changes.
+    """
+
+    def __init__(self, cache_dir=None, memory_entries=128, max_disk_bytes=64 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir) if cache_dir else Path.home() / '.password_analyzer_cache'
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = OrderedDict()
+
+    def fingerprint(self, file_path):
+        """Return a fingerprint of the export that changes whenever the file does.
+
+        Stale results of an earlier version of the same file are removed.
+        """
+        path = Path(file_path).resolve()
+        stat = path.stat()
+        digest = hashlib.sha256(f"{path}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+        with open(path, 'rb') as f:
+            digest.update(f.read(FINGERPRINT_SAMPLE_SIZE))
+            if stat.st_size > FINGERPRINT_SAMPLE_SIZE:
+                f.seek(max(FINGERPRINT_SAMPLE_SIZE, stat.st_size - FINGERPRINT_SAMPLE_SIZE))
+                digest.update(f.read())
+
+        file_key = hashlib.sha256(str(path).encode()).hexdigest()[:16]
+        fingerprint = f"{file_key}-{digest.hexdigest()[:32]}"
+        self._invalidate_stale(file_key, fingerprint)
+        return fingerprint
+
+    def _invalidate_stale(self, file_key, fingerprint):
+        """Remove cached results of other versions of the same export."""
+        for stale in self.cache_dir.glob(f"{file_key}-*"):
+            if stale.name != fingerprint:
+                shutil.rmtree(stale, ignore_errors=True)
+        for key in [key for key in self.memory if key[0].startswith(file_key) and key[0] != fingerprint]:
+            del self.memory[key]
+
+    def _query_key(self, query):
+        payload = json.dumps([CACHE_VERSION] + list(query), sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, fingerprint, query):
+        """Return the cached row positions for a query, or None."""
+        key = (fingerprint, self._query_key(query))
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key]
+
+        path = self.cache_dir / fingerprint / f"{key[1]}.npy"
+        try:
+            positions = np.load(path)
+            os.utime(path)  # Mark as recently used for trimming
+        except (OSError, ValueError):
+            return None
+        self._remember(key, positions)
+        return positions
+
+    def put(self, fingerprint, query, positions):
+        """Store the row positions matching a query."""
+        key = (fingerprint, self._query_key(query))
+        positions = np.asarray(positions, dtype=np.int64)
+        self._remember(key, positions)
+
+        directory = self.cache_dir / fingerprint
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            temp_path = directory / f"{key[1]}.tmp.npy"
+            np.save(temp_path, positions)
+            os.replace(temp_path, directory / f"{key[1]}.npy")
+            self._trim()
+        except OSError:
+            # The on-disk store is best effort; the in-memory entry still applies
+            pass
+
+    def _remember(self, key, positions):
+        self.memory[key] = positions
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.memory_entries:
+            self.memory.popitem(last=False)
+
+    def _trim(self):
+        """Delete least recently used files until the store fits its size limit."""
+        entries = [(entry.stat().st_mtime, entry.stat().st_size, entry)
+                   for entry in self.cache_dir.glob('*/*.npy')]
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_disk_bytes:
+                break
+            entry.unlink()
+            total -= size
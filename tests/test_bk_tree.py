@@ -0,0 +1,31 @@
+import random
+
+from bk_tree import BKTree, edit_distance
+
+
+def reference_distance(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def test_edit_distance_matches_dynamic_programming():
+    rng = random.Random(7)
+    for _ in range(2000):
+        a = ''.join(rng.choices('abc', k=rng.randint(0, 12)))
+        b = ''.join(rng.choices('abc', k=rng.randint(0, 80)))
+        assert edit_distance(a, b) == reference_distance(a, b)
+        assert edit_distance(b, a) == reference_distance(a, b)
+
+
+def test_search_finds_values_within_distance():
+    values = ['github.com', 'gitlab.com', 'google.com', 'goggle.com', 'example.org']
+    tree = BKTree(values)
+
+    assert len(tree) == len(values)
+    assert sorted(tree.search('gogle.com', 1)) == [('goggle.com', 1), ('google.com', 1)]
+    assert tree.search('github.com', 0) == [('github.com', 0)]
@@ -0,0 +1,80 @@
+import os
+
+from password_analyzer import PasswordManagerAnalyzer
+
+
+def write_csv(path, lines):
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+
+def test_diff_of_identical_exports_with_repeated_keys_is_unchanged(tmp_path):
+    lines = ['name,url,username,password',
+             'a,https://x.com,bob,p1',
+             'b,https://x.com,bob,p2',
+             'c,https://y.com,al,p3',
+             'd,https://x.com,bob,p4']
+    old = write_csv(tmp_path / 'old.csv', lines)
+    new = write_csv(tmp_path / 'new.csv', lines)
+
+    analyzer = PasswordManagerAnalyzer(str(old))
+    for chunksize in (1, 2, 100):
+        counts = analyzer.diff(str(new), chunksize=chunksize).summary()
+        assert counts == {'added': 0, 'removed': 0, 'changed': 0, 'rotated': 0, 'unchanged': 4}
+
+
+def test_diff_pairs_repeated_keys_in_order(tmp_path):
+    old = write_csv(tmp_path / 'old.csv', ['name,url,username,password',
+                                           'a,https://x.com,bob,p1',
+                                           'b,https://x.com,bob,p2'])
+    new = write_csv(tmp_path / 'new.csv', ['name,url,username,password',
+                                           'a,https://x.com,bob,p1',
+                                           'b,https://x.com,bob,rotated',
+                                           'c,https://x.com,bob,p3'])
+
+    counts = PasswordManagerAnalyzer(str(old)).diff(str(new), chunksize=1).summary()
+    assert counts == {'added': 1, 'removed': 0, 'changed': 1, 'rotated': 1, 'unchanged': 1}
+
+
+def test_dedupe_never_merges_entries_without_url_or_username(tmp_path):
+    path = write_csv(tmp_path / 'export.csv', ['name,url,username,password,notes',
+                                               'note a,,,,first',
+                                               'note b,,,,second',
+                                               'card,,,,1234',
+                                               'a,https://www.x.com,bob,p1,',
+                                               'b,https://x.com/login,bob,p2,'])
+
+    analyzer = PasswordManagerAnalyzer(str(path))
+    for rules in (('newest',), ('longest_notes',), ('most_fields',)):
+        kept = analyzer.dedupe(rules)
+        assert kept['name'].tolist()[:3] == ['note a', 'note b', 'card']
+        assert len(kept) == 4
+    assert analyzer.summarize().duplicate_entries == len(analyzer.data) - len(analyzer.dedupe())
+
+
+def touch_later(path, analyzer):
+    # Make the change visible even on filesystems with coarse timestamps
+    mtime_ns = analyzer._file_state['mtime_ns'] + 10 ** 9
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_refresh_reloads_same_size_edits_and_appends_new_rows(tmp_path):
+    lines = ['name,url,username,password'] + [f'n{i},https://s{i}.com,u{i},pass{i:04d}' for i in range(10)]
+    path = write_csv(tmp_path / 'export.csv', lines)
+    analyzer = PasswordManagerAnalyzer(str(path))
+    assert analyzer.refresh()[0] == 'unchanged'
+
+    # An in-place edit keeps the size but must not be mistaken for an append
+    path.write_text(path.read_text(encoding='utf-8').replace('pass0005', 'PASS0005'), encoding='utf-8')
+    touch_later(path, analyzer)
+    status, rows = analyzer.refresh()
+    assert status == 'reloaded'
+    assert analyzer.data['password'].tolist()[5] == 'PASS0005'
+
+    with open(path, 'a', encoding='utf-8') as handle:
+        handle.write('n10,https://s10.com,u10,pass0010\n')
+    touch_later(path, analyzer)
+    status, rows = analyzer.refresh()
+    assert status == 'appended'
+    assert rows['password'].tolist() == ['pass0010']
+    assert len(analyzer.data) == 11
@@ -0,0 +1,176 @@
+import io
+import json
+import zipfile
+
+import pandas as pd
+import pytest
+from pandas.testing import assert_frame_equal
+
+import vault_readers
+from vault_readers import (_JsonStream, read_bitwarden_json, read_csv_parallel, read_keepass_xml,
+                           read_onepassword_1pux)
+
+
+def write_export(path, rows):
+    lines = ['name,url,username,password,notes,favorite,uses,extra']
+    lines.extend(rows)
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return path
+
+
+def test_parallel_read_matches_read_csv_for_mixed_ranges(tmp_path):
+    rows = []
+    for i in range(300):
+        # Ranges differ in which columns are blank, bool, int or multi-line
+        favorite = '' if 100 <= i < 200 else ('True' if i % 2 else 'False')
+        uses = '' if i >= 250 else str(i)
+        notes = f'"line one\nline ""{i}""\nline three"' if i % 7 == 0 else f'note {i}'
+        extra = 'text' if i == 299 else ('1' if i < 150 else '')
+        rows.append(f'n{i},https://s{i}.example.com,user{i},pw{i},{notes},{favorite},{uses},{extra}')
+    path = write_export(tmp_path / 'export.csv', rows)
+
+    expected = pd.read_csv(path)
+    for workers in (2, 3, 5):
+        result = read_csv_parallel(path, workers=workers)
+        assert_frame_equal(result, expected)
+        assert result['favorite'].dropna().map(type).eq(bool).all()
+
+
+def test_parallel_read_keeps_bool_column_without_blanks(tmp_path):
+    rows = [f'n{i},https://s{i}.example.com,user{i},pw{i},,{"True" if i % 3 else "False"},{i},'
+            for i in range(90)]
+    path = write_export(tmp_path / 'export.csv', rows)
+
+    assert_frame_equal(read_csv_parallel(path, workers=3), pd.read_csv(path))
+
+
+def test_json_stream_decodes_across_every_block_edge(monkeypatch):
+    document = {
+        'n': 1.5, 'big': -12345.678e-3, 'flag': True, 'none': None,
+        'text': 'quote " and \\u00e9 and \\n newline',
+        'items': [{'id': i, 'value': i * 0.25, 'tags': ['a', 'b']} for i in range(5)],
+    }
+    text = json.dumps(document)
+    for block_size in range(1, 80):
+        monkeypatch.setattr(vault_readers, 'READ_BLOCK_SIZE', block_size)
+        context = {}
+        items = list(_JsonStream(io.StringIO(text)).walk(('items', '*'), context))
+        assert items == document['items'], block_size
+        assert context == {key: value for key, value in document.items() if key != 'items'}, block_size
+
+
+def write_1pux(path, data):
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('export.attributes', '{"version": 3}')
+        archive.writestr('export.data', json.dumps(data))
+    return path
+
+
+def onepassword_item(title, username):
+    return {
+        'overview': {'title': title, 'url': f'https://{title}.example.com'},
+        'details': {
+            'loginFields': [{'designation': 'username', 'value': username},
+                            {'designation': 'password', 'value': f'{title}-pw'}],
+            'notesPlain': f'{title} notes',
+            'sections': [{'fields': [{'value': {'totp': f'otpauth://{title}'}}]}],
+        },
+    }
+
+
+def test_onepassword_items_are_named_after_their_own_vault(tmp_path):
+    data = {'accounts': [{
+        'attrs': {'name': 'Acct'},
+        'vaults': [
+            {'attrs': {'name': 'Shared'}, 'items': [onepassword_item('a', 'ann')]},
+            # Attributes after the items, and a vault without attributes
+            {'items': [onepassword_item('b', 'bob'), onepassword_item('c', 'cat')],
+             'attrs': {'name': 'Private'}},
+            {'items': [onepassword_item('d', 'dan')]},
+        ],
+    }]}
+    path = write_1pux(tmp_path / 'export.1pux', data)
+
+    frame = pd.concat(read_onepassword_1pux(path, batch_size=2), ignore_index=True)
+    assert frame['name'].tolist() == ['a', 'b', 'c', 'd']
+    assert frame['folder'].tolist()[:3] == ['Shared', 'Private', 'Private']
+    assert pd.isna(frame.loc[3, 'folder'])
+    assert frame.loc[1, ['username', 'password', 'notes', 'totp']].tolist() == \
+        ['bob', 'b-pw', 'b notes', 'otpauth://b']
+
+
+def test_parallel_read_falls_back_on_stray_quotes(tmp_path):
+    rows = [f'n{i},https://s{i}.example.com,user{i},pw{i},"note {i}\nsecond line",True,{i},' for i in range(120)]
+    # read_csv accepts a quote inside an unquoted field
+    rows[10] = 'n10,https://s10.example.com,user10,pw10,he said 5" tall,True,10,'
+    path = write_export(tmp_path / 'export.csv', rows)
+
+    expected = pd.read_csv(path)
+    for workers in (2, 3, 4):
+        assert_frame_equal(read_csv_parallel(path, workers=workers), expected)
+
+
+def bitwarden_item(name, folder_id=None):
+    return {'name': name, 'folderId': folder_id, 'notes': None,
+            'login': {'username': f'{name}-user', 'password': f'{name}-pw', 'totp': None,
+                      'uris': [{'uri': f'https://{name}.example.com'}]}}
+
+
+def test_bitwarden_resolves_folders_listed_before_or_after_items(tmp_path):
+    folders = [{'id': 'f1', 'name': 'Work'}]
+    items = [bitwarden_item('a', 'f1'), bitwarden_item('b'), bitwarden_item('c', 'f1')]
+    for layout in ({'encrypted': False, 'folders': folders, 'items': items},
+                   {'encrypted': False, 'items': items, 'folders': folders}):
+        path = tmp_path / 'export.json'
+        path.write_text(json.dumps(layout), encoding='utf-8')
+
+        frame = pd.concat(read_bitwarden_json(path, batch_size=1), ignore_index=True)
+        assert frame['name'].tolist() == ['a', 'b', 'c']
+        assert frame.loc[[0, 2], 'folder'].tolist() == ['Work', 'Work']
+        assert pd.isna(frame.loc[1, 'folder'])
+        assert frame.loc[0, ['url', 'username', 'password']].tolist() == \
+            ['https://a.example.com', 'a-user', 'a-pw']
+
+
+def test_bitwarden_rejects_password_protected_exports(tmp_path):
+    path = tmp_path / 'export.json'
+    path.write_text(json.dumps({'encrypted': True, 'passwordProtected': True, 'data': 'abc'}),
+                    encoding='utf-8')
+
+    with pytest.raises(ValueError, match='Encrypted'):
+        list(read_bitwarden_json(path))
+
+
+def test_keepass_reads_nested_groups_and_skips_history(tmp_path):
+    path = tmp_path / 'export.xml'
+    path.write_text('''<?xml version="1.0" encoding="utf-8"?>
+<KeePassFile><Root><Group><Name>Root</Name>
+  <Entry>
+    <String><Key>Title</Key><Value>top</Value></String>
+    <String><Key>UserName</Key><Value>ann</Value></String>
+  </Entry>
+  <Group><Name>Email</Name>
+    <Entry>
+      <String><Key>Title</Key><Value>mail</Value></String>
+      <String><Key>URL</Key><Value>https://mail.example.com</Value></String>
+      <String><Key>UserName</Key><Value>bob</Value></String>
+      <String><Key>Password</Key><Value>new</Value></String>
+      <String><Key>Notes</Key><Value>line one
+line two</Value></String>
+      <History><Entry>
+        <String><Key>Title</Key><Value>mail</Value></String>
+        <String><Key>Password</Key><Value>old</Value></String>
+      </Entry></History>
+    </Entry>
+  </Group>
+  <Entry>
+    <String><Key>Title</Key><Value>after</Value></String>
+  </Entry>
+</Group></Root></KeePassFile>
+''', encoding='utf-8')
+
+    frame = pd.concat(read_keepass_xml(path, batch_size=2), ignore_index=True)
+    assert frame['name'].tolist() == ['top', 'mail', 'after']
+    assert frame['folder'].tolist() == ['Root', 'Root/Email', 'Root']
+    assert frame.loc[1, ['url', 'username', 'password', 'notes']].tolist() == \
+        ['https://mail.example.com', 'bob', 'new', 'line one\nline two']
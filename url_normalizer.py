@@ -0,0 +1,85 @@
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Derived columns produced from the url column of an export
+URL_COLUMNS = ['url_scheme', 'url_host', 'url_port', 'url_domain', 'url_path']
+
+# Maximum number of distinct URLs kept in the normalization cache
+URL_CACHE_SIZE = 65536
+
+PUBLIC_SUFFIX_FILE = Path(__file__).with_name('public_suffix_list.dat')
+
+
+@lru_cache(maxsize=None)
+def load_public_suffixes(path=PUBLIC_SUFFIX_FILE):
+    """Load the bundled public suffix list into (rules, exceptions) sets."""
+    rules = set()
+    exceptions = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            rule = line.strip().lower()
+            if not rule or rule.startswith('//'):
+                continue
+            target = rules
+            if rule.startswith('!'):
+                target, rule = exceptions, rule[1:]
+            target.add(rule)
+            # Hosts usually arrive punycoded, so index both spellings
+            try:
+                target.add(rule.encode('idna').decode('ascii'))
+            except UnicodeError:
+                pass
+    return rules, exceptions
+
+
+def registrable_domain(host):
+    """Return the registrable domain (public suffix plus one label) of a host."""
+    if not host or host.replace('.', '').isdigit() or ':' in host:
+        return None
+
+    rules, exceptions = load_public_suffixes()
+    labels = host.strip('.').split('.')
+
+    # The first (longest) matching rule wins; unlisted TLDs count as suffixes
+    suffix_length = 1
+    for i in range(len(labels)):
+        candidate = '.'.join(labels[i:])
+        if candidate in exceptions:
+            suffix_length = len(labels) - i - 1
+            break
+        wildcard = '*.' + '.'.join(labels[i + 1:])
+        if candidate in rules or (i + 1 < len(labels) and wildcard in rules):
+            suffix_length = len(labels) - i
+            break
+
+    if len(labels) <= suffix_length:
+        return None
+    return '.'.join(labels[-(suffix_length + 1):])
+
+
+@lru_cache(maxsize=URL_CACHE_SIZE)
+def normalize_url(url):
+    """Split a URL into (scheme, host, port, registrable domain, path).
+
+    URLs without a scheme, such as ``example.com/login``, are treated as
+    host-first. Missing parts are returned as ``None``.
+    """
+    value = str(url).strip()
+    if '://' not in value:
+        value = '//' + value
+
+    try:
+        parts = urlsplit(value)
+        port = parts.port
+    except ValueError:
+        return None, None, None, None, None
+
+    host = parts.hostname
+    return (
+        parts.scheme.lower() or None,
+        host,
+        port,
+        registrable_domain(host),
+        parts.path or None,
+    )
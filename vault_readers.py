@@ -0,0 +1,488 @@
+import io
+import json
+import mmap
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Normalized schema every native format reader produces
+VAULT_COLUMNS = ['name', 'url', 'username', 'password', 'notes', 'totp', 'folder']
+
+DEFAULT_BATCH_SIZE = 100000
+READ_BLOCK_SIZE = 1 << 20
+
+# Files at least this large are parsed with read_csv_parallel
+PARALLEL_CSV_THRESHOLD = 64 << 20
+QUOTE = ord('"')
+
+# Characters that can continue a JSON number
+_NUMBER_CHARS = frozenset('0123456789.eE+-')
+
+
+class _JsonStream:
+    """Minimal incremental JSON tokenizer over a text stream.
+
+    Values are decoded one at a time with ``json.JSONDecoder.raw_decode`` on a
+    sliding buffer, so only the value currently being decoded is held in memory.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _refill(self):
+        """Drop the consumed prefix and read the next block."""
+        block = self.stream.read(READ_BLOCK_SIZE)
+        if not block:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + block
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._refill():
+                return ''
+
+    def expect(self, char):
+        """Consume the given structural character."""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Malformed JSON: expected '{char}' but found '{found or 'end of file'}'")
+        self.pos += 1
+
+    def decode_value(self):
+        """Decode and consume the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._refill():
+                    continue
+                raise
+            # A number running up to the buffer edge may be truncated, e.g. '1.' of '1.5'
+            if (isinstance(value, (int, float)) and not isinstance(value, bool) and not self.eof
+                    and all(char in _NUMBER_CHARS for char in self.buffer[end:]) and self._refill()):
+                continue
+            self.pos = end
+            return value
+
+    def walk(self, path, context):
+        """Yield the values found at ``path``.
+
+        ``path`` is a sequence of object keys, with ``'*'`` standing for every
+        element of an array. Sibling values skipped on the way are decoded and
+        stored by key, so readers can use metadata such as folder lists or
+        vault names. Each enclosing object gets its own dict: ``context`` for
+        the outermost one, and ``scopes`` holds those of the objects around
+        the value being yielded, innermost last. Siblings that follow the
+        path are only stored once the walk has passed them.
+        """
+        self.scopes = []
+        return self._walk(path, context)
+
+    def _walk(self, path, scope=None):
+        if not path:
+            yield self.decode_value()
+            return
+
+        head, rest = path[0], path[1:]
+        if head == '*':
+            self.expect('[')
+            while self.peek() != ']':
+                yield from self._walk(rest)
+                if self.peek() == ',':
+                    self.pos += 1
+            self.expect(']')
+        else:
+            scope = {} if scope is None else scope
+            self.scopes.append(scope)
+            self.expect('{')
+            while self.peek() != '}':
+                key = self.decode_value()
+                self.expect(':')
+                if key == head:
+                    yield from self._walk(rest)
+                else:
+                    scope[key] = self.decode_value()
+                if self.peek() == ',':
+                    self.pos += 1
+            self.expect('}')
+            self.scopes.pop()
+
+
+def _batches(records, batch_size):
+    """Group normalized records into DataFrames of at most ``batch_size`` rows."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield pd.DataFrame.from_records(batch, columns=VAULT_COLUMNS)
+            batch = []
+    if batch:
+        yield pd.DataFrame.from_records(batch, columns=VAULT_COLUMNS)
+
+
+def read_csv(file_path, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield a CSV export in batches, keeping its own columns."""
+    for chunk in pd.read_csv(file_path, chunksize=batch_size):
+        chunk.columns = chunk.columns.str.lower()
+        yield chunk
+
+
+def _count_quotes(data, start, end):
+    """Count quote characters in data[start:end], a block at a time."""
+    quotes = 0
+    for block_start in range(start, end, READ_BLOCK_SIZE * 16):
+        block = data[block_start:min(end, block_start + READ_BLOCK_SIZE * 16)]
+        quotes += int(np.count_nonzero(block == QUOTE))
+    return quotes
+
+
+def _next_record_start(buffer, data, position, scanned, quotes):
+    """Return the first record boundary after ``position`` with the updated quote count.
+
+    A newline only ends a record when an even number of quotes precedes it,
+    since escaped quotes are doubled. That keeps quoted fields with embedded
+    newlines, such as multi-line notes, inside a single record.
+    """
+    newline = buffer.find(b'\n', position)
+    while newline >= 0:
+        quotes += _count_quotes(data, scanned, newline)
+        scanned = newline
+        if quotes % 2 == 0:
+            return newline + 1, scanned, quotes
+        newline = buffer.find(b'\n', newline + 1)
+    return -1, scanned, quotes
+
+
+def _find_record_boundaries(buffer, parts):
+    """Return offsets splitting the records after the header into about ``parts`` ranges."""
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    size = len(data)
+    header_end, scanned, quotes = _next_record_start(buffer, data, 0, 0, 0)
+    if header_end < 0:
+        return [size]
+
+    offsets = [header_end]
+    for i in range(1, parts):
+        target = max(header_end + (size - header_end) * i // parts, offsets[-1] + 1)
+        offset, scanned, quotes = _next_record_start(buffer, data, target - 1, scanned, quotes)
+        if offset < 0 or offset >= size:
+            break
+        offsets.append(offset)
+
+    offsets.append(size)
+    return offsets
+
+
+def _parse_csv_range(file_path, start, end, columns, read_options):
+    """Parse one byte range of a CSV file; runs in worker processes."""
+    with open(file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return pd.read_csv(io.BytesIO(buffer[start:end]), header=None,
+                               names=columns, **read_options)
+
+
+def _parse_csv_ranges(file_path, ranges, columns, workers, read_options):
+    """Parse byte ranges of a CSV file in a process pool, preserving their order."""
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+        futures = [executor.submit(_parse_csv_range, file_path, start, end, columns, read_options)
+                   for start, end in ranges]
+        return [future.result() for future in futures]
+
+
+def _value_kind(series):
+    """Classify the values read_csv inferred for a column as bool, number or string."""
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return 'bool'
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return 'number'
+    # True/False columns with blanks come back as object holding Python bools
+    if series.dropna().map(type).eq(bool).all():
+        return 'bool'
+    return 'string'
+
+
+def _reconcile_dtypes(chunks):
+    """Return the columns whose values were inferred as incompatible types across chunks.
+
+    The other columns are cast the way a single read_csv call would have
+    inferred them: True/False columns with blanks anywhere become object
+    columns of bools, and columns that are entirely empty in a chunk take
+    the type inferred elsewhere.
+    """
+    conflicts = []
+    for col in chunks[0].columns:
+        kinds = {_value_kind(chunk[col]) for chunk in chunks if chunk[col].notna().any()}
+        if len(kinds) > 1:
+            conflicts.append(col)
+        elif kinds == {'bool'}:
+            if any(not pd.api.types.is_bool_dtype(chunk[col].dtype) for chunk in chunks):
+                for chunk in chunks:
+                    chunk[col] = chunk[col].astype(object)
+        elif kinds == {'string'}:
+            dtypes = {chunk[col].dtype for chunk in chunks if chunk[col].notna().any()}
+            if len(dtypes) == 1:
+                dtype = dtypes.pop()
+                for chunk in chunks:
+                    if not chunk[col].notna().any():
+                        chunk[col] = chunk[col].astype(dtype)
+    return conflicts
+
+
+def read_csv_parallel(file_path, workers=None, **read_options):
+    """Read a CSV file by parsing byte ranges of a memory map in a process pool.
+
+    The file is split at record boundaries into one range per worker and the
+    parsed ranges are concatenated once. Columns that different ranges infer
+    as incompatible types are parsed again as strings so the result matches
+    a single ``pd.read_csv`` call. ``read_options`` such as ``usecols`` and
+    ``dtype`` are passed on to every range.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers < 2:
+        return pd.read_csv(file_path, **read_options)
+    columns = list(pd.read_csv(file_path, nrows=0).columns)
+
+    with open(file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            offsets = _find_record_boundaries(buffer, workers)
+
+    ranges = [(start, end) for start, end in zip(offsets, offsets[1:]) if start < end]
+    if len(ranges) < 2:
+        return pd.read_csv(file_path, **read_options)
+
+    try:
+        chunks = _parse_csv_ranges(file_path, ranges, columns, workers, read_options)
+        conflicts = _reconcile_dtypes(chunks)
+        if conflicts:
+            options = dict(read_options, dtype={col: str for col in conflicts})
+            chunks = _parse_csv_ranges(file_path, ranges, columns, workers, options)
+            _reconcile_dtypes(chunks)
+    except pd.errors.ParserError:
+        # A stray quote inside an unquoted field, which read_csv tolerates,
+        # throws off the quote parity the ranges were split by
+        return pd.read_csv(file_path, **read_options)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def read_csv_tail(file_path, start, columns, **read_options):
+    """Parse the complete records written after byte offset ``start``.
+
+    A partially written last record is left for the next call. Returns the
+    parsed rows (None if there were none) and the offset just past the last
+    complete record.
+    """
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        tail = f.read()
+
+    data = np.frombuffer(tail, dtype=np.uint8)
+    newlines = np.flatnonzero(data == ord('\n'))
+    quotes_before = np.cumsum(data == QUOTE)[newlines] if len(newlines) else newlines
+    complete = newlines[quotes_before % 2 == 0]
+    if not len(complete):
+        return None, start
+
+    end = int(complete[-1]) + 1
+    if not tail[:end].strip():
+        return None, start + end
+    rows = pd.read_csv(io.BytesIO(tail[:end]), header=None, names=columns, **read_options)
+    return rows, start + end
+
+
+def _bitwarden_record(item, folders):
+    login = item.get('login') or {}
+    uris = login.get('uris') or []
+    return {
+        'name': item.get('name'),
+        'url': uris[0].get('uri') if uris else None,
+        'username': login.get('username'),
+        'password': login.get('password'),
+        'notes': item.get('notes'),
+        'totp': login.get('totp'),
+        'folder': folders.get(item.get('folderId')),
+    }
+
+
+def _check_bitwarden_encryption(context):
+    if context.get('encrypted'):
+        raise ValueError("Encrypted Bitwarden exports are not supported. Please export unencrypted JSON.")
+
+
+def _bitwarden_records(file_path):
+    """Yield normalized Bitwarden items.
+
+    Bitwarden writes ``folders`` before ``items``, so items stream straight
+    through. If the folder list comes later, items from the first one in a
+    folder onwards are held back until the end of the file, when their
+    folder names are known.
+    """
+    with open(file_path, 'r', encoding='utf-8-sig') as f:
+        stream = _JsonStream(f)
+        context = {}
+        folders = None
+        pending = []
+        for item in stream.walk(('items', '*'), context):
+            _check_bitwarden_encryption(context)
+            if folders is None and 'folders' in context:
+                folders = {folder.get('id'): folder.get('name') for folder in context['folders'] or []}
+
+            # Later items wait too, keeping the export's order
+            if pending or (folders is None and item.get('folderId')):
+                pending.append(item)
+            else:
+                yield _bitwarden_record(item, folders or {})
+
+    # Password protected exports have no items, only encrypted data
+    _check_bitwarden_encryption(context)
+    folders = {folder.get('id'): folder.get('name') for folder in context.get('folders') or []}
+    for item in pending:
+        yield _bitwarden_record(item, folders)
+
+
+def read_bitwarden_json(file_path, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield a Bitwarden JSON export in normalized batches."""
+    return _batches(_bitwarden_records(file_path), batch_size)
+
+
+_KEEPASS_FIELDS = {
+    'Title': 'name',
+    'URL': 'url',
+    'UserName': 'username',
+    'Password': 'password',
+    'Notes': 'notes',
+    'otp': 'totp',
+}
+
+
+def _keepass_records(file_path):
+    stack = []
+    groups = []
+    history_depth = 0
+
+    for event, elem in ET.iterparse(file_path, events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            if elem.tag == 'History':
+                history_depth += 1
+            elif elem.tag == 'Group':
+                groups.append(None)
+            continue
+
+        stack.pop()
+        parent = stack[-1] if stack else None
+
+        if elem.tag == 'Name' and parent is not None and parent.tag == 'Group':
+            groups[-1] = elem.text
+        elif elem.tag == 'Group':
+            groups.pop()
+        elif elem.tag == 'History':
+            history_depth -= 1
+        elif elem.tag == 'Entry' and not history_depth:
+            record = dict.fromkeys(VAULT_COLUMNS)
+            for string in elem.findall('String'):
+                column = _KEEPASS_FIELDS.get(string.findtext('Key'))
+                if column:
+                    record[column] = string.findtext('Value')
+            record['folder'] = '/'.join(name for name in groups if name)
+            yield record
+
+        # Release finished entries so memory stays bounded
+        if elem.tag == 'Entry' and parent is not None:
+            parent.remove(elem)
+
+
+def read_keepass_xml(file_path, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield a KeePass 2 XML export in normalized batches."""
+    return _batches(_keepass_records(file_path), batch_size)
+
+
+def _onepassword_record(item, vault):
+    overview = item.get('overview') or {}
+    details = item.get('details') or {}
+    record = {
+        'name': overview.get('title'),
+        'url': overview.get('url'),
+        'username': None,
+        'password': details.get('password'),
+        'notes': details.get('notesPlain'),
+        'totp': None,
+        'folder': (vault.get('attrs') or {}).get('name'),
+    }
+    for field in details.get('loginFields') or []:
+        if field.get('designation') in ('username', 'password'):
+            record[field['designation']] = field.get('value')
+    for section in details.get('sections') or []:
+        for field in section.get('fields') or []:
+            value = field.get('value') or {}
+            if 'totp' in value and not record['totp']:
+                record['totp'] = value['totp']
+    return record
+
+
+def _onepassword_records(file_path):
+    """Yield normalized 1Password items, named after their vault.
+
+    Items stream straight through when the vault's ``attrs`` precede its
+    ``items``. Otherwise they are held back until the vault ends and its
+    name is known.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open('export.data') as raw:
+            stream = _JsonStream(io.TextIOWrapper(raw, encoding='utf-8'))
+            path = ('accounts', '*', 'vaults', '*', 'items', '*')
+            pending, pending_vault = [], None
+            for item in stream.walk(path, {}):
+                vault = stream.scopes[-1]
+                # Reaching another vault means the previous one is complete
+                if vault is not pending_vault:
+                    for held in pending:
+                        yield _onepassword_record(held, pending_vault)
+                    pending, pending_vault = [], None
+
+                if pending or 'attrs' not in vault:
+                    pending.append(item)
+                    pending_vault = vault
+                else:
+                    yield _onepassword_record(item, vault)
+
+    for held in pending:
+        yield _onepassword_record(held, pending_vault)
+
+
+def read_onepassword_1pux(file_path, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield a 1Password .1pux export in normalized batches."""
+    return _batches(_onepassword_records(file_path), batch_size)
+
+
+# Readers by file extension; register additional formats here
+FORMAT_READERS = {
+    '.csv': read_csv,
+    '.json': read_bitwarden_json,
+    '.xml': read_keepass_xml,
+    '.1pux': read_onepassword_1pux,
+}
+
+
+def get_reader(file_extension):
+    """Return the reader registered for a file extension."""
+    reader = FORMAT_READERS.get(file_extension)
+    if reader is None:
+        supported = ', '.join(sorted(FORMAT_READERS))
+        raise ValueError(f"Unsupported file format: {file_extension}. Supported formats: {supported}")
+    return reader